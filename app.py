@@ -1,15 +1,25 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
 from dotenv import load_dotenv
 import streamlit as st
 
 # 📚 1. 법률 용어 사전 모듈
-from legal_dict import extract_and_define_terms
+from legal_dict import extract_and_define_terms, run_on_term_loop
 
 # 📜 2. 법령 검색 모듈
 from legal_search import search_law_articles_semantically
 
 # 🤖 3. AI 서비스 모듈 (Gemini)
 from llm_service import (
-    create_easy_legal_interpretation, 
+    InterpretationError,
+    stream_easy_legal_interpretation,
+    simplify_legal_terms,
     extract_search_law_name, 
     generate_legal_answer
 )
@@ -23,6 +33,87 @@ from integrated_rag import generate_integrated_answer, evaluate_rag_response
 # 환경 변수 로드
 load_dotenv()
 
+
+# --- 캐싱 래퍼 ---
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _norm(text: str) -> str:
+    """전각/반각, 공백·줄바꿈 차이만 있는 입력이 같은 캐시 키를 갖도록 정규화"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def _cache_key(text: str) -> str:
+    return hashlib.sha256(_norm(text).encode("utf-8")).hexdigest()
+
+
+# 같은 텍스트로 다시 요청하면 법제처 API를 다시 호출하지 않고 메모리에서 바로 반환
+# 캐시 키는 정규화 해시(key)만 사용하고, 원문(_text)은 해싱에서 제외된다 (밑줄 인자)
+@st.cache_data(ttl=86400, max_entries=512, show_spinner=False)
+def _cached_terms(key: str, _text: str) -> dict:
+    return run_on_term_loop(extract_and_define_terms(_text))
+
+
+# Gemini 본문 해석은 스트리밍으로 그리고, 완성된 문자열만 텍스트별로 보관해 재사용
+# (st.cache_data 는 스트리밍 중간 결과를 화면에 낼 수 없어 직접 보관)
+INTERPRETATION_MEMO_MAX = 256
+INTERPRETATION_MEMO_TTL = 3600   # 초 (기존 st.cache_data(ttl=3600) 과 동일)
+
+
+@st.cache_resource
+def _interpretation_memo() -> tuple:
+    # key -> (expires_at, text), 여러 세션 스레드가 함께 쓰므로 잠금과 같이 보관
+    return {}, threading.Lock()
+
+
+def render_main_interpretation(key: str, text: str) -> str:
+    memo, lock = _interpretation_memo()
+    with lock:
+        item = memo.get(key)
+        if item is not None and item[0] < time.time():
+            memo.pop(key, None)
+            item = None
+    if item is not None:
+        st.write(item[1])
+        return item[1]
+
+    try:
+        final = st.write_stream(stream_easy_legal_interpretation(text))
+    except InterpretationError as e:
+        # 실패 문구는 보관하지 않음 → 다음 요청에서 다시 호출
+        st.error(str(e))
+        return str(e)
+
+    with lock:
+        if key not in memo and len(memo) >= INTERPRETATION_MEMO_MAX:
+            memo.pop(next(iter(memo)), None)
+        memo[key] = (time.time() + INTERPRETATION_MEMO_TTL, final)
+    return final
+
+
+# 쉬운 용어 사전은 용어 정의 조합이 같으면 재사용
+# dict는 해싱이 불안정하므로 정렬된 JSON 문자열로 넘긴다
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_simplified_terms(terms_json: str) -> dict:
+    return simplify_legal_terms(json.loads(terms_json))
+
+
+# 용어 목록은 마크다운 한 덩어리로 미리 만들어 두고 재실행 시 그대로 재사용
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_terms_markdown(terms_json: str, simplified_json: str) -> str:
+    term_definitions = json.loads(terms_json)
+    simplified_terms = json.loads(simplified_json)
+
+    blocks = []
+    for term, data in term_definitions.items():
+        easy_def = simplified_terms.get(term, "쉬운 해석 없음")
+        block = f"#### {term}\n> 💡 **쉬운 정의:** {easy_def}"
+        if data['english'] != "N/A":
+            block += f"\n\n*English: {data['english']}*"
+        blocks.append(block)
+    return "\n\n---\n\n".join(blocks)
+
+
 # --- Streamlit 페이지 설정 ---
 st.set_page_config(
     page_title="⚖️ Legal AI Helper", 
@@ -56,30 +147,29 @@ with tab1:
         if not original_text:
             st.warning("텍스트를 입력해주세요.")
         else:
-            with st.spinner("1단계: 법률 용어 분석... (법제처 API 호출 중)"):
-                term_definitions = extract_and_define_terms(original_text)
+            # 법제처 용어 조회(백그라운드 스레드)와 Gemini 본문 해석(스트리밍)을 동시에 실행
+            text_key = _cache_key(original_text)
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                terms_future = pool.submit(_cached_terms, text_key, original_text)
 
-            with st.spinner("2단계: AI가 용어 정의를 쉽게 풀고, 본문을 해석 중입니다... (Gemini 호출 중)"):
-                llm_result = create_easy_legal_interpretation(original_text, term_definitions)
-                
-                # 결과 파싱
-                easy_interpretation = llm_result.get("main_interpretation", "해석을 생성하지 못했습니다.")
-                simplified_terms = llm_result.get("simplified_terms", {})
+                st.subheader("상세 해석 내용")
+                render_main_interpretation(text_key, original_text)
+
+                with st.spinner("법률 용어를 분석 중입니다... (법제처 API 호출 중)"):
+                    term_definitions = terms_future.result()
+
+            with st.spinner("AI가 용어 정의를 쉽게 풀고 있습니다... (Gemini 호출 중)"):
+                terms_json = json.dumps(term_definitions, sort_keys=True, ensure_ascii=False)
+                simplified_terms = _cached_simplified_terms(terms_json)
 
                 # 결과 출력
                 st.success("해석이 완료되었습니다!")
-                st.text_area("상세 해석 내용", value=easy_interpretation, height=300)
 
                 if term_definitions:
                     st.subheader(" ")
                     with st.expander("💡 AI가 참고한 법률 용어 보기"):
-                        for term, data in term_definitions.items():
-                            st.markdown(f"#### {term}")
-                            easy_def = simplified_terms.get(term, "쉬운 해석 없음")
-                            st.info(f"**쉬운 정의:** {easy_def}")
-                            if data['english'] != "N/A":
-                                st.caption(f"English: {data['english']}")
-                            st.divider()
+                        simplified_json = json.dumps(simplified_terms, sort_keys=True, ensure_ascii=False)
+                        st.markdown(_build_terms_markdown(terms_json, simplified_json))
 
 # ============================================================
 # [탭 2] 법령 기반 상담 (Rule-based Agent)
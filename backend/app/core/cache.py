@@ -6,9 +6,10 @@ from typing import Any, Optional
 
 
 class InMemoryCache:
-    def __init__(self, default_ttl: int = 60 * 10):
+    def __init__(self, default_ttl: int = 60 * 10, max_entries: Optional[int] = None):
         self._store: dict[str, tuple[float, Any]] = {}
         self._default_ttl = default_ttl
+        self._max_entries = max_entries
 
     def make_key(self, text: str) -> str:
         return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -26,8 +27,20 @@ class InMemoryCache:
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         expires_at = time.time() + (ttl or self._default_ttl)
+        if self._max_entries and key not in self._store and len(self._store) >= self._max_entries:
+            # 가장 먼저 들어온 항목부터 제거 (dict 는 삽입 순서 유지)
+            self._store.pop(next(iter(self._store)), None)
         self._store[key] = (expires_at, value)
 
+    def delete(self, key: str) -> None:
+        self._store.pop(key, None)
+
 
 # 계약 문서 분석용 캐시 인스턴스
 contract_cache = InMemoryCache(default_ttl=60 * 5)
+
+# Firebase ID 토큰 검증 결과 캐시 (token hash -> User.id)
+token_cache = InMemoryCache(default_ttl=60, max_entries=10_000)
+
+# 법령 용어 정의 캐시 (term -> TermDefinition dict, 정의 없음은 {} 로 저장)
+term_cache = InMemoryCache(default_ttl=60 * 60 * 24, max_entries=10_000)
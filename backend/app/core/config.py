@@ -18,8 +18,9 @@ from pydantic_settings import BaseSettings
 BASE_DIR = Path(__file__).resolve().parents[2]
 ENV_PATH = BASE_DIR / ".env"
 
+# .env 는 여기서 한 번만 읽는다 (Settings 는 os.environ 만 참조)
 if ENV_PATH.exists():
-    load_dotenv(ENV_PATH)
+    load_dotenv(ENV_PATH, override=False)
 else:
     print(f"⚠️  .env 파일을 찾을 수 없습니다: {ENV_PATH}")
 
@@ -34,18 +35,37 @@ class Settings(BaseSettings):
     GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = None
     SUPREME_COURT_API_KEY: Optional[str] = None
 
+    # --- DB ---
+    # 1 이면 서버 시작 시 create_all 실행 (스키마 변경 배포 시에만 켜기)
+    RUN_DDL: bool = False
+
+    # --- LLM 요청 배칭 (동시 요청을 한 번의 Gemini 호출로 합침) ---
+    LLM_BATCH_ENABLED: bool = False
+    LLM_BATCH_MAX_SIZE: int = 3
+    LLM_BATCH_MAX_WAIT_MS: int = 50
+
+    # --- 프롬프트 사전 분석 정보(조항 원문)에 쓸 최대 입력 토큰 수 (근사치) ---
+    PROMPT_INPUT_TOKEN_BUDGET: int = 3000
+
+    # --- 조항별 동시 분석 (조항마다 작은 프롬프트를 LLM_CONCURRENCY 개씩 병렬 호출) ---
+    LLM_CLAUSE_SPLIT_ENABLED: bool = False
+    LLM_CONCURRENCY: int = 6
+
+    # --- 의미 기반 분석 캐시 (임베딩 코사인 유사도가 임계값 이상이면 기존 분석 재사용) ---
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+
     # --- App Metadata ---
     DEBUG: bool = False
     APP_NAME: str = "Legal AI Backend"
 
     class Config:
-        env_file = ENV_PATH
-        env_file_encoding = "utf-8"
         extra = "ignore"
+        frozen = True   # 프로세스당 한 번 만들고 변경 불가
 
 
 # -----------------------------------------------------
-# 📌 3) settings 캐싱
+# 📌 3) settings 캐싱 (프로세스당 한 번만 생성, 코드에서는 settings 사용)
 # -----------------------------------------------------
 @lru_cache
 def get_settings():
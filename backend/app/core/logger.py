@@ -5,6 +5,8 @@
 
 import logging
 
+from app.core.config import settings
+
 LOGGER_NAME = "legal-ai"
 
 
@@ -13,7 +15,8 @@ def setup_logging() -> logging.Logger:
     if logger.handlers:
         return logger  # 이미 설정됨
 
-    logger.setLevel(logging.INFO)
+    # 개발(DEBUG=1)에서만 LLM 응답 원문 등 디버그 로그 출력
+    logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
 
     handler = logging.StreamHandler()
     fmt = "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"
@@ -0,0 +1,129 @@
+# backend/app/core/resilience.py
+"""
+외부 API(Gemini / 법제처) 호출용 재시도 + 서킷 브레이커
+
+- 429/503/타임아웃 같은 일시 장애는 지수 백오프(+지터)로 몇 번 다시 시도한다.
+- 연속 실패가 fail_max 번 쌓이면 reset_timeout 동안 호출 없이 바로 CircuitOpenError 를 낸다.
+  (장애 중인 서버에 요청이 몰려 모든 분석이 재시도 대기로 묶이는 것을 막음)
+- reset_timeout 이 지나면 한 번 시험 호출을 허용하고, 성공하면 다시 닫힌다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+from app.core.logger import logger
+
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출을 건너뜀"""
+
+
+class CircuitBreaker:
+    """
+    closed → (연속 실패 fail_max 번) → open → (reset_timeout 경과) → half-open
+    half-open 에서는 시험 호출 하나만 통과시키고, 그 결과가 나올 때까지 나머지는 계속 차단한다.
+    (이벤트 루프 한 곳에서만 쓰므로 잠금 없음)
+    """
+
+    def __init__(self, name: str, fail_max: int = 10, reset_timeout: float = 30.0):
+        self.name = name
+        self._fail_max = fail_max
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False   # half-open 시험 호출 진행 중
+
+    @property
+    def is_open(self) -> bool:
+        """호출이 차단되는 상태인지 (open, 또는 half-open 인데 시험 호출이 이미 나가 있음)"""
+        if self._opened_at is None:
+            return False
+        if time.monotonic() - self._opened_at < self._reset_timeout:
+            return True
+        return self._probing
+
+    def before_call(self) -> bool:
+        """차단 상태면 CircuitOpenError. 통과한 호출이 half-open 시험 호출이면 True."""
+        if self.is_open:
+            raise CircuitOpenError(f"{self.name} 서킷 브레이커 열림")
+        if self._opened_at is not None:
+            # reset_timeout 이 지난 첫 호출 → 이 호출만 시험으로 통과
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self, probe: bool = False) -> None:
+        self._failures += 1
+        if probe:
+            # 시험 호출 실패 → 바로 다시 open
+            self._probing = False
+            self._opened_at = time.monotonic()
+            logger.warning("⚠️ %s 시험 호출 실패 → %.0f초간 다시 호출 차단", self.name, self._reset_timeout)
+        elif self._failures >= self._fail_max:
+            if self._opened_at is None:
+                logger.warning(
+                    "⚠️ %s 연속 실패 %d회 → %.0f초간 호출 차단",
+                    self.name, self._failures, self._reset_timeout,
+                )
+            self._opened_at = time.monotonic()
+
+    def release(self, probe: bool) -> None:
+        """성공/실패로 볼 수 없는 예외(취소 등)로 끝난 시험 호출 자리를 반납"""
+        if probe:
+            self._probing = False
+
+
+async def retry_async(
+    call: Callable[[], Awaitable[T]],
+    *,
+    retry_on: Tuple[Type[BaseException], ...],
+    breaker: Optional[CircuitBreaker] = None,
+    attempts: int = 4,
+    initial_wait: float = 0.5,
+    max_wait: float = 8.0,
+) -> T:
+    """
+    call() 을 retry_on 예외에 한해 최대 attempts 번 실행한다.
+    대기 시간은 initial_wait * 2^n (max_wait 상한) 범위에서 무작위 (full jitter).
+    브레이커가 열려 있으면 대기 없이 CircuitOpenError 를 낸다.
+    """
+    for attempt in range(attempts):
+        probe = breaker.before_call() if breaker is not None else False
+
+        try:
+            result = await call()
+        except retry_on as e:
+            if breaker is not None:
+                breaker.record_failure(probe)
+                if breaker.is_open:
+                    # 이번 실패로 브레이커가 열렸으면 더 기다리지 않음
+                    raise CircuitOpenError(f"{breaker.name} 서킷 브레이커 열림") from e
+            if attempt == attempts - 1:
+                raise
+            wait = random.uniform(0, min(max_wait, initial_wait * 2 ** attempt))
+            logger.warning("⚠️ 일시 오류 → %.2f초 후 재시도 (%d/%d): %r", wait, attempt + 1, attempts - 1, e)
+            await asyncio.sleep(wait)
+            continue
+        except BaseException:
+            # 재시도 대상이 아닌 예외 / 취소 → 시험 호출이었다면 자리만 반납하고 그대로 전파
+            if breaker is not None:
+                breaker.release(probe)
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+    raise AssertionError("unreachable")
@@ -1,5 +1,6 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # backend/app/db/database.py의 절대 경로 기준
@@ -8,10 +9,44 @@ ROOT_DIR = os.path.dirname(os.path.dirname(BASE_DIR))   # backend/
 
 DB_PATH = os.path.join(ROOT_DIR, "legal_ai.db")
 DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
+
+# 커넥션마다 적용할 SQLite 튜닝 (WAL: 읽기/쓰기 동시성, 나머지: 캐시/임시 저장소 메모리화)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,        # 64MB 페이지 캐시
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,      # 256MB
+    "foreign_keys": "ON",        # ON DELETE CASCADE 동작에 필요 (SQLite 기본값 OFF)
+}
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
 
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=10,
+    max_overflow=20,
 )
+event.listen(engine, "connect", _apply_sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+
+# 조회 위주 async 엔드포인트용 (스레드풀을 거치지 않음)
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+Base = declarative_base()
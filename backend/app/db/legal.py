@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -7,9 +7,13 @@ from app.db.database import Base
 # =========================
 class Clause(Base):
     __tablename__ = "clauses"
+    __table_args__ = (
+        # 문서별 조항 목록 (document_id 필터 + id 정렬)
+        Index("ix_clauses_doc_id_id", "document_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    document_id = Column(Integer, ForeignKey("document.id"), nullable=False, index=True)
+    document_id = Column(Integer, ForeignKey("document.id", ondelete="CASCADE"), nullable=False, index=True)
 
     clause_id = Column(String(50), nullable=True)
     title = Column(String(255), nullable=True)
@@ -27,9 +31,13 @@ class Clause(Base):
 # =========================
 class Term(Base):
     __tablename__ = "terms"
+    __table_args__ = (
+        # 문서별 용어 목록 (document_id 필터 + id 정렬)
+        Index("ix_terms_doc_id_id", "document_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    document_id = Column(Integer, ForeignKey("document.id"), nullable=False, index=True)
+    document_id = Column(Integer, ForeignKey("document.id", ondelete="CASCADE"), nullable=False, index=True)
 
     term = Column(String(255), nullable=False)
     korean = Column(Text, nullable=True)
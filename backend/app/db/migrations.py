@@ -0,0 +1,93 @@
+# backend/app/db/migrations.py
+"""
+기존 DB 에 나중에 추가된 컬럼/인덱스 보정 (create_all 은 이미 있는 테이블을 ALTER 하지 않음)
+
+- 서버 시작 시 매번 실행 (PRAGMA 조회 + IF NOT EXISTS 라 가벼움)
+- 없는 컬럼만 ADD COLUMN + 인덱스 생성, 이미 있으면 아무것도 하지 않음
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.logger import logger
+
+
+# (테이블, 컬럼, 타입, 인덱스 이름 또는 None)
+ADDED_COLUMNS = [
+    ("document", "batch_job", "VARCHAR(255)", "ix_document_batch_job"),
+]
+
+
+# (인덱스 이름, 테이블, 컬럼들) — 모델의 __table_args__ 에 나중에 추가된 복합 인덱스
+ADDED_INDEXES = [
+    ("ix_docs_user_created", "document", ("user_id", "created_at")),
+    ("ix_clauses_doc_id_id", "clauses", ("document_id", "id")),
+    ("ix_terms_doc_id_id", "terms", ("document_id", "id")),
+    ("ix_conv_user_created", "conversations", ("user_id", "created_at")),
+    ("ix_bm_user_created", "bookmarks", ("user_id", "created_at")),
+]
+
+
+def _table_exists(conn, table: str) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": table},
+    ).first() is not None
+
+
+def ensure_added_columns(engine: Engine) -> None:
+    with engine.begin() as conn:
+        for table, column, col_type, index_name in ADDED_COLUMNS:
+            existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+            if not existing:
+                continue   # 테이블 자체가 없음 → create_all 이 만듦
+
+            if column not in existing:
+                logger.info(f"📌 {table}.{column} 컬럼 추가")
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"))
+
+            if index_name:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})"))
+
+
+def ensure_added_indexes(engine: Engine) -> None:
+    with engine.begin() as conn:
+        for index_name, table, columns in ADDED_INDEXES:
+            if not _table_exists(conn, table):
+                continue   # 테이블 자체가 없음 → create_all 이 인덱스까지 만듦
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({', '.join(columns)})"
+            ))
+
+
+def _has_unique_index(conn, table: str, column: str) -> bool:
+    for _, name, unique, *_ in conn.execute(text(f"PRAGMA index_list({table})")):
+        if unique:
+            cols = [row[2] for row in conn.execute(text(f"PRAGMA index_info({name})"))]
+            if cols == [column]:
+                return True
+    return False
+
+
+def ensure_unique_share_links(engine: Engine) -> None:
+    """
+    share_links.conversation_id UNIQUE 보정 (create-share-link 의 ON CONFLICT 대상)
+
+    예전 DB 에는 같은 이름의 일반 인덱스만 있으므로, 대화당 가장 먼저 만든 링크만 남기고
+    일반 인덱스를 UNIQUE 인덱스로 교체한다 (create_all 이 만드는 이름과 동일).
+    """
+    with engine.begin() as conn:
+        if not _table_exists(conn, "share_links"):
+            return
+        if _has_unique_index(conn, "share_links", "conversation_id"):
+            return
+
+        logger.info("📌 share_links.conversation_id UNIQUE 인덱스 생성 (중복 링크 정리)")
+        conn.execute(text(
+            "DELETE FROM share_links WHERE id NOT IN"
+            " (SELECT MIN(id) FROM share_links GROUP BY conversation_id)"
+        ))
+        conn.execute(text("DROP INDEX IF EXISTS ix_share_links_conversation_id"))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX ix_share_links_conversation_id ON share_links (conversation_id)"
+        ))
@@ -4,10 +4,11 @@
 + 계약서 분석 확장 필드 추가
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
+from app.db.types import CompressedText
 
 
 # =========================
@@ -15,17 +16,21 @@ from app.db.database import Base
 # =========================
 class Document(Base):
     __tablename__ = "document"
+    __table_args__ = (
+        # 사용자별 문서 목록 (user_id 필터 + created_at 정렬)
+        Index("ix_docs_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     # 기존 필드
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    original_text = Column(Text, nullable=False)
+    original_text = Column(CompressedText, nullable=False)   # zlib 압축 저장
 
     title = Column(String(255), nullable=True)
     original_filename = Column(String(255), nullable=True)
     summary = Column(Text, nullable=True)
-    answer_markdown = Column(Text, nullable=True)
+    answer_markdown = Column(CompressedText, nullable=True)  # zlib 압축 저장
 
     risk_score = Column(Integer, nullable=True)
     user_query = Column(Text, nullable=True)
@@ -38,13 +43,16 @@ class Document(Base):
     parties = Column(String(255), nullable=True)             # "임대인,임차인"
     risk_level = Column(String(20), nullable=True)           # 낮음/중간/높음/치명적
 
+    # Gemini Batch 작업 이름 (대량 분석 요청으로 생성된 문서만)
+    batch_job = Column(String(255), nullable=True, index=True)
+
     # 관계
     # ❗ 수정됨: document → documents
     user = relationship("User", back_populates="documents")
 
-    # Clause, Term 관계
-    clauses = relationship("Clause", back_populates="document", cascade="all, delete-orphan")
-    terms = relationship("Term", back_populates="document", cascade="all, delete-orphan")
+    # Clause, Term 관계 (삭제는 DB 의 ON DELETE CASCADE 에 맡김 → 자식 로딩 없이 삭제)
+    clauses = relationship("Clause", back_populates="document", cascade="all, delete-orphan", passive_deletes=True, order_by="Clause.id")
+    terms = relationship("Term", back_populates="document", cascade="all, delete-orphan", passive_deletes=True, order_by="Term.id")
 
 
 # =========================
@@ -76,6 +84,10 @@ class User(Base):
 # =========================
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        # 사용자별 히스토리 (user_id 필터 + created_at 정렬)
+        Index("ix_conv_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -96,6 +108,10 @@ class Conversation(Base):
 # =========================
 class Bookmark(Base):
     __tablename__ = "bookmarks"
+    __table_args__ = (
+        # 사용자별 북마크 목록 (user_id 필터 + created_at 정렬)
+        Index("ix_bm_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -113,7 +129,7 @@ class ShareLink(Base):
     __tablename__ = "share_links"
 
     id = Column(Integer, primary_key=True, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False, index=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False, unique=True, index=True)   # 대화당 공유 링크 1개 (UPSERT 대상)
     token = Column(String(64), unique=True, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -0,0 +1,33 @@
+# backend/app/db/types.py
+"""
+커스텀 컬럼 타입
+
+- CompressedText: 큰 텍스트(분석 결과 JSON, OCR 원문)를 zlib 로 압축해 BLOB 으로 저장.
+  파이썬 쪽에서는 그대로 str 로 읽고 쓴다.
+"""
+
+import zlib
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+
+class CompressedText(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, level: int = 6, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), self.level)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # 압축 도입 전에 TEXT 로 저장된 행은 그대로 반환
+        if isinstance(value, str):
+            return value
+        return zlib.decompress(value).decode("utf-8")
@@ -2,6 +2,8 @@
 
 import os
 import json
+import time
+from functools import lru_cache
 
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -10,18 +12,26 @@ from sqlalchemy.orm import Session
 import firebase_admin
 from firebase_admin import auth, credentials
 
-from app.db.database import SessionLocal
+from app.core.cache import token_cache
+from app.db.database import AsyncSessionLocal, SessionLocal
 from app.db.models import User
 
 
 # =========================
 # 🔥 Firebase Admin 초기화
 # =========================
-firebase_key_json = os.getenv("FIREBASE_ADMIN_KEY")
-firebase_key_path = os.getenv("FIREBASE_ADMIN_KEY_PATH")
+@lru_cache(maxsize=None)
+def _init_firebase() -> firebase_admin.App:
+    """
+    Firebase Admin 앱을 프로세스당 한 번만 초기화한다.
+    - FIREBASE_ADMIN_KEY (JSON 문자열) 가 FIREBASE_ADMIN_KEY_PATH 보다 우선
+    - 키 파싱/인증서 생성은 최초 호출 시 한 번만 수행
+    """
+    if firebase_admin._apps:
+        return firebase_admin.get_app()
 
-if not firebase_admin._apps:
-    cred = None
+    firebase_key_json = os.getenv("FIREBASE_ADMIN_KEY")
+    firebase_key_path = os.getenv("FIREBASE_ADMIN_KEY_PATH")
 
     if firebase_key_json:
         # 1) JSON 문자열 방식 (Render 환경에서 주로 사용)
@@ -40,7 +50,10 @@ if not firebase_admin._apps:
     else:
         raise Exception("❌ FIREBASE_ADMIN_KEY 또는 FIREBASE_ADMIN_KEY_PATH 중 하나는 반드시 설정해야 합니다.")
 
-    firebase_admin.initialize_app(cred)
+    return firebase_admin.initialize_app(cred)
+
+
+_init_firebase()
 
 
 # =========================
@@ -54,6 +67,11 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # =========================
 # 🔐 HTTP Bearer 인증
 # =========================
@@ -68,12 +86,22 @@ def get_current_user(
     - 프론트에서 Authorization: Bearer <idToken> 을 보내면
     - Firebase ID Token 검증 → uid, email, name 가져와서
     - 내부 User DB에서 조회 / 없으면 생성
+    - 검증된 토큰은 최대 60초(토큰 만료 전까지) 캐시 → 재검증/유저 조회 생략
     """
 
     if not credentials or not credentials.credentials:
         raise HTTPException(status_code=401, detail="인증 토큰이 없습니다.")
 
     id_token = credentials.credentials
+    cache_key = token_cache.make_key(id_token)
+
+    # 캐시 히트 → PK 조회 한 번으로 끝
+    cached_user_id = token_cache.get(cache_key)
+    if cached_user_id is not None:
+        user = db.get(User, cached_user_id)
+        if user:
+            return user
+        token_cache.delete(cache_key)
 
     try:
         decoded = auth.verify_id_token(id_token)
@@ -102,4 +130,9 @@ def get_current_user(
         db.commit()
         db.refresh(user)
 
+    # 토큰 만료 시각을 넘겨서 캐시하지 않도록 TTL 조정
+    ttl = min(60, int(decoded.get("exp", 0) - time.time()))
+    if ttl > 0:
+        token_cache.set(cache_key, user.id, ttl=ttl)
+
     return user
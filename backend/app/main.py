@@ -1,20 +1,27 @@
 # backend/app/main.py
 
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.routes.legal import router as legal_router
 from app.routes.file_routes import router as file_router
 from app.routes.law_routes import router as law_router
 from app.routes.contract_routes import router as contract_router
-from app.routes.legal import router as legal_router
-from app.db.database import Base, engine
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.database import Base, DB_PATH, engine
+from app.db.migrations import ensure_added_columns, ensure_added_indexes, ensure_unique_share_links
+from app.services.law_api import close_session as close_law_session
 from app.routes.auth_test import router as auth_test
 
 app = FastAPI(
     title="Legal AI Backend",
     description="계약서/법률 문서 심층 분석 API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,   # 응답 JSON 인코딩은 orjson 으로
 )
 
 app.add_middleware(
@@ -25,18 +32,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 라우터 등록
+# 라우터 등록 (legal 라우터는 프론트가 사용하는 /api 접두사로 한 번만 등록)
 app.include_router(legal_router, prefix="/api", tags=["legal"])
 app.include_router(file_router)
 app.include_router(law_router)
 app.include_router(contract_router)
-app.include_router(legal_router, prefix="/legal")
 app.include_router(auth_test)
 
 
 
 @app.on_event("startup")
 def on_startup():
-    print("📌 DB 초기화 중...")
-    Base.metadata.create_all(bind=engine)
-    print("📌 DB 테이블 생성 완료") 
\ No newline at end of file
+    # 매 부팅마다 DDL 을 돌리지 않고, DB 파일이 없거나 RUN_DDL=1 일 때만 테이블 생성
+    if settings.RUN_DDL or not os.path.exists(DB_PATH):
+        logger.info("📌 DB 테이블 생성 중...")
+        Base.metadata.create_all(bind=engine)
+        logger.info("📌 DB 테이블 생성 완료")
+
+    # 기존 DB 파일에는 create_all 이 새 컬럼/인덱스를 추가하지 않으므로 따로 보정
+    ensure_added_columns(engine)
+    ensure_added_indexes(engine)
+    ensure_unique_share_links(engine)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await close_law_session()
@@ -9,44 +9,37 @@ from typing import List, Optional
 from app.utils.text_cleaner import normalize_whitespace
 
 
-@dataclass
+# 분석 요청마다 쓰이는 정규식은 모듈 로드 시 한 번만 컴파일
+_KO_CHAR = re.compile(r"[가-힣]")
+_EN_CHAR = re.compile(r"[A-Za-z]")
+_CLAUSE_HEADER = re.compile(r"(제\s*\d+\s*조[^\n]*)", re.MULTILINE)
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_CLAUSE_TITLE = re.compile(r"\(([^)]+)\)")
+_CLAUSE_NUMBER = re.compile(r"제\s*(\d+)\s*조")
+_KO_WORD = re.compile(r"[가-힣]{2,}")
+
+
+# 문서마다 조항 수만큼 만들어지므로 slots 로 인스턴스 __dict__ 를 없앰
+@dataclass(slots=True)
 class Clause:
     clause_id: str
     title: Optional[str]
     raw_text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class NLPInfo:
     clauses: List[Clause] = field(default_factory=list)
     language: str = "ko"
     domain_tags: List[str] = field(default_factory=list)
     parties: List[str] = field(default_factory=list)
     candidate_terms: List[str] = field(default_factory=list)
-# -----------------------------------------
-# 0) Konlpy(Okt) Lazy Loader 추가
-# -----------------------------------------
-_okt = None
-
-def get_okt():
-    global _okt
-
-    if _okt is None:
-        import jpype
-        if not jpype.isJVMStarted():
-            jpype.startJVM(classpath=[])
-
-        from konlpy.tag import Okt
-        _okt = Okt()
-
-    return _okt
-
 # ---------------------------------------------------------
 # 1) 언어 추론
 # ---------------------------------------------------------
 def _guess_language(text: str) -> str:
-    ko = len(re.findall(r"[가-힣]", text))
-    en = len(re.findall(r"[A-Za-z]", text))
+    ko = len(_KO_CHAR.findall(text))
+    en = len(_EN_CHAR.findall(text))
     if ko > 0 and en > 0:
         return "vie"
     if ko > 0:
@@ -62,12 +55,11 @@ def _guess_language(text: str) -> str:
 def _split_clauses(text: str) -> List[Clause]:
     text = normalize_whitespace(text)
 
-    pattern = re.compile(r"(제\s*\d+\s*조[^\n]*)", re.MULTILINE)
-    matches = list(pattern.finditer(text))
+    matches = list(_CLAUSE_HEADER.finditer(text))
 
     # 패턴이 없으면 문단 단위로 fallback
     if not matches:
-        chunks = re.split(r"\n\s*\n", text)
+        chunks = _PARAGRAPH_BREAK.split(text)
         clauses = []
         for idx, chunk in enumerate(chunks, start=1):
             cl_text = chunk.strip()
@@ -90,10 +82,10 @@ def _split_clauses(text: str) -> List[Clause]:
         header = match.group(1).strip()
         body = text[start:end].strip()
 
-        title_match = re.search(r"\(([^)]+)\)", header)
+        title_match = _CLAUSE_TITLE.search(header)
         title = title_match.group(1).strip() if title_match else None
 
-        clause_id_match = re.search(r"제\s*(\d+)\s*조", header)
+        clause_id_match = _CLAUSE_NUMBER.search(header)
         clause_id = f"제{clause_id_match.group(1)}조" if clause_id_match else f"clause_{i+1}"
 
         clauses.append(
@@ -150,7 +142,7 @@ def _guess_parties(text: str) -> List[str]:
 # ---------------------------------------------------------
 def _extract_candidate_terms(text: str) -> List[str]:
     # 한글 2글자 이상 단어만 추출
-    words = re.findall(r"[가-힣]{2,}", text)
+    words = _KO_WORD.findall(text)
     words = sorted(set(words))
 
     # 불용어 제거
@@ -159,13 +151,19 @@ def _extract_candidate_terms(text: str) -> List[str]:
     clean_words = [w for w in words if w not in stopwords]
     return clean_words[:30]
 
+
+def extract_candidate_terms(text: str) -> List[str]:
+    """법제처 조회용 후보 용어만 먼저 뽑기 (나머지 NLP 와 용어 조회를 겹쳐 돌릴 때 사용)"""
+    return _extract_candidate_terms(normalize_whitespace(text))
+
 # ---------------------------------------------------------
 # 6) NLPInfo 구성함수
 # ---------------------------------------------------------
 def build_nlp_info(
     text: str,
     language_hint: Optional[str] = None,
-    force_language: Optional[str] = None
+    force_language: Optional[str] = None,
+    candidate_terms: Optional[List[str]] = None,
 ) -> NLPInfo:
     text_norm = normalize_whitespace(text)
 
@@ -179,7 +177,8 @@ def build_nlp_info(
     clauses = _split_clauses(text_norm)
     domain_tags = _guess_domain_tags(text_norm)
     parties = _guess_parties(text_norm)
-    candidate_terms = _extract_candidate_terms(text_norm)
+    if candidate_terms is None:
+        candidate_terms = _extract_candidate_terms(text_norm)
 
     return NLPInfo(
         clauses=clauses,
@@ -1,39 +1,37 @@
 # backend/app/routes/contract_routes.py
 
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from app.deps.auth import get_current_user, get_db
+import asyncio
+from datetime import datetime
+from typing import List, Optional
 
-from app.db.database import SessionLocal
-from app.services.llm import analyze_contract
-from app.services.document_service import save_document
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, selectinload
+from app.deps.auth import get_current_user, get_db, get_async_db
+
+from app.services.llm import analyze_contract, parse_contract_analysis
+from app.services.llm_batch import submit_contract_batch, fetch_batch_results
+from app.services.llm_prompt import build_contract_analysis_prompt
 from app.services.document_service import (
-    list_documents,
-    get_document,
+    save_document,
+    create_pending_documents,
+    attach_batch_job,
+    discard_pending_documents,
+    complete_pending_document,
 )
 from app.nlp.extractor import build_nlp_info
-from app.services.law_api import fetch_term_definitions
+from app.services.analysis import prepare_contract_inputs
 
 from app.db.models import User, Document
 from app.db.legal import Clause, Term
 
 
-
 router = APIRouter(prefix="/contracts", tags=["Contract Analysis"])
 
 
-# ---------------------------
-# DB 의존성
-# ---------------------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # =============================================
 # 1) 계약서 전체 분석 + DB 저장 API
 # =============================================
@@ -62,11 +60,8 @@ async def analyze_full_contract(
     if not req.text.strip():
         raise HTTPException(400, "분석할 텍스트가 비었습니다.")
 
-    # 1) NLP
-    nlp_info = build_nlp_info(req.text, language_hint=req.language)
-
-    # 2) 용어 정의
-    term_definitions = await fetch_term_definitions(nlp_info.candidate_terms)
+    # 1) NLP(스레드) + 2) 용어 정의
+    nlp_info, term_definitions = await prepare_contract_inputs(req.text, language_hint=req.language)
 
     # 3) LLM 분석 (🔥 UI 언어 반영)
     analysis: DocumentResult = await analyze_contract(
@@ -76,8 +71,9 @@ async def analyze_full_contract(
         output_language=req.language,  # 🔥 핵심
     )
 
-    # 4) DB 저장
-    saved = save_document(
+    # 4) DB 저장 (동기 커밋은 스레드풀에서)
+    saved = await run_in_threadpool(
+        save_document,
         db=db,
         analysis=analysis,
         file_name=req.filename,
@@ -95,74 +91,280 @@ async def analyze_full_contract(
 
 
 # =============================================
-# 2) 문서 리스트 조회 API
+# 1-1) 대량 계약서 분석 (Gemini Batch API)
 # =============================================
-@router.get("/list")
-def list_all_documents(
+class ContractBulkAnalyzeRequest(BaseModel):
+    contracts: List[ContractAnalyzeRequest] = Field(..., min_length=1)
+
+
+class ContractBulkAnalyzeResponse(BaseModel):
+    batch_id: str
+    state: str
+    document_ids: List[int]
+    completed_ids: List[int] = Field(default_factory=list)
+
+
+@router.post("/analyze_bulk", response_model=ContractBulkAnalyzeResponse)
+async def analyze_bulk_contracts(
+    req: ContractBulkAnalyzeRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    docs = db.query(Document).filter(
-        Document.user_id == current_user.id
-    ).order_by(Document.created_at.desc()).all()
-
-    return [
-        {
-            "id": d.id,
-            "title": d.title,
-            "summary": d.summary,
-            "risk_score": d.risk_score,
-            "created_at": d.created_at,
-            "language": d.language,     # 🔥 언어 포함
-            "is_favorite": d.is_favorite,
-        }
-        for d in docs
+    """
+    여러 계약서를 Gemini Batch 작업 하나로 제출 (비용 50% 절감, 결과는 비동기)
+    - 문서는 먼저 대기 상태로 저장되고, 결과는 GET /contracts/analyze_bulk/{batch_id} 로 수집
+    """
+    if any(not c.text.strip() for c in req.contracts):
+        raise HTTPException(400, "분석할 텍스트가 비었습니다.")
+
+    # 문서별 NLP + 용어 조회를 동시에 실행
+    prepared = await asyncio.gather(*(
+        prepare_contract_inputs(c.text, language_hint=c.language)
+        for c in req.contracts
+    ))
+
+    prompts = [
+        build_contract_analysis_prompt(c.text, nlp_info, term_definitions, c.language)
+        for c, (nlp_info, term_definitions) in zip(req.contracts, prepared)
     ]
 
+    # 대기 문서는 Batch 제출 전에 커밋 (업로드 동안 SQLite 쓰기 잠금을 잡고 있지 않도록)
+    doc_ids = await run_in_threadpool(
+        create_pending_documents,
+        db=db,
+        user_id=current_user.id,
+        contracts=[(c.text, c.filename, c.language) for c in req.contracts],
+    )
+
+    try:
+        job_name = await asyncio.to_thread(
+            submit_contract_batch,
+            [(str(doc_id), prompt) for doc_id, prompt in zip(doc_ids, prompts)],
+        )
+    except Exception as e:
+        await run_in_threadpool(discard_pending_documents, db, doc_ids)
+        raise HTTPException(503, f"Batch 작업 생성 실패: {e}")
+
+    await run_in_threadpool(attach_batch_job, db, doc_ids, job_name)
+
+    return ContractBulkAnalyzeResponse(
+        batch_id=job_name.split("/", 1)[-1],
+        state="JOB_STATE_PENDING",
+        document_ids=doc_ids,
+    )
+
+
+def _collect_batch_results(db: Session, job_name: str, user_id: int) -> Optional[ContractBulkAnalyzeResponse]:
+    """
+    (스레드풀에서 실행) Batch 상태 조회 + 성공 시 대기 문서에 결과 저장.
+    DB 조회/커밋, Batch 결과 다운로드, NLP 재구성이 모두 동기 작업이라 이벤트 루프 밖에서 처리한다.
+    """
+    docs = db.query(Document).filter(
+        Document.batch_job == job_name,
+        Document.user_id == user_id,
+    ).order_by(Document.id).all()
+
+    if not docs:
+        return None
+
+    document_ids = [d.id for d in docs]
+    completed = {d.id for d in docs if d.summary is not None}
+    # 커밋 후 만료된 속성을 다시 읽지 않도록 필요한 값만 미리 꺼내 둠
+    pending = [(d.id, d.title, d.language or "ko", d.original_text) for d in docs if d.summary is None]
+    state = "JOB_STATE_SUCCEEDED"
+
+    if pending:
+        state, results = fetch_batch_results(job_name)
+
+        if results is not None:
+            for doc_id, title, language, original_text in pending:
+                nlp_info = build_nlp_info(original_text, language_hint=language)
+                analysis = parse_contract_analysis(results.get(str(doc_id), ""), nlp_info)
+                # 동시에 들어온 다른 폴링이 먼저 채웠으면 False → 어느 쪽이든 완료 상태
+                complete_pending_document(db, doc_id, title, language, analysis)
+                completed.add(doc_id)
+
+    return ContractBulkAnalyzeResponse(
+        batch_id=job_name.split("/", 1)[-1],
+        state=state,
+        document_ids=document_ids,
+        completed_ids=[i for i in document_ids if i in completed],
+    )
+
+
+@router.get("/analyze_bulk/{batch_id}", response_model=ContractBulkAnalyzeResponse)
+async def poll_bulk_analysis(
+    batch_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Batch 작업 상태 조회 → 성공 시 결과를 내려받아 대기 문서에 저장
+    """
+    response = await run_in_threadpool(
+        _collect_batch_results, db, f"batches/{batch_id}", current_user.id
+    )
+    if response is None:
+        raise HTTPException(404, "Batch 작업을 찾을 수 없습니다.")
+    return response
+
+
+# =============================================
+# 조회 응답 모델
+# =============================================
+class DocumentListItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    risk_score: Optional[int] = None
+    created_at: Optional[datetime] = None
+    language: Optional[str] = None     # 🔥 언어 포함
+    is_favorite: Optional[bool] = None
+
+
+class DocumentDetail(DocumentListItem):
+    risk_level: Optional[str] = None
+    parties: Optional[str] = None
+    domain_tags: Optional[str] = None
+
+
+class ClauseItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    clause_id: Optional[str] = None
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    risk_level: Optional[str] = None
+    risk_score: Optional[int] = None
+
+
+class TermItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    term: str
+    korean: Optional[str] = None
+    english: Optional[str] = None
+    source: Optional[str] = None
+
+
+class DocumentFull(DocumentDetail):
+    clauses: List[ClauseItem] = Field(default_factory=list)
+    terms: List[TermItem] = Field(default_factory=list)
+
+
+def _get_owned_document(db: Session, document_id: int, user_id: int) -> Optional[Document]:
+    # PK 조회 (identity map 우선) 후 소유자 확인
+    doc = db.get(Document, document_id)
+    if doc is None or doc.user_id != user_id:
+        return None
+    return doc
+
+
+def _document_detail(doc: Document) -> DocumentDetail:
+    detail = DocumentDetail.model_validate(doc)
+    detail.risk_level = doc.risk_level or "중간"   # 🔥 추가
+    return detail
+
+
+# =============================================
+# 2) 문서 리스트 조회 API
+# =============================================
+@router.get("/list", response_model=List[DocumentListItem])
+async def list_all_documents(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    # 목록에 필요한 컬럼만 로딩 (original_text 등 큰 컬럼 제외)
+    result = await db.execute(
+        select(Document)
+        .options(load_only(
+            Document.id,
+            Document.title,
+            Document.summary,
+            Document.risk_score,
+            Document.created_at,
+            Document.language,
+            Document.is_favorite,
+        ))
+        .where(Document.user_id == current_user.id)
+        .order_by(Document.created_at.desc())
+    )
+    return [DocumentListItem.model_validate(d) for d in result.scalars()]
+
 
 ## =============================================
 # 3) 문서 상세 조회 API (수정 버전)
 # =============================================
-@router.get("/{document_id}")
-def get_document_detail(
+@router.get("/{document_id}", response_model=DocumentDetail)
+async def get_document_detail(
     document_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    doc = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Document).where(
+            Document.id == document_id,
+            Document.user_id == current_user.id,
+        )
+    )
+    doc = result.scalar_one_or_none()
 
     if not doc:
         raise HTTPException(404, "문서를 찾을 수 없습니다.")
 
-    return {
-        "id": doc.id,
-        "title": doc.title,
-        "summary": doc.summary,
-        "risk_score": doc.risk_score,
-        "risk_level": doc.risk_level or "중간",   # 🔥 추가
-        "parties": doc.parties,
-        "domain_tags": doc.domain_tags,
-        "language": doc.language,
-        "created_at": doc.created_at,
-        "is_favorite": doc.is_favorite,
-    }
+    return _document_detail(doc)
+
+
+# =============================================
+# 3-1) 문서 상세 + 조항 + 용어 한 번에 조회 API
+# =============================================
+@router.get("/{document_id}/full", response_model=DocumentFull)
+async def get_document_full(
+    document_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    상세/조항/용어를 한 번의 요청으로 반환 (/clauses, /terms 를 따로 부르지 않아도 됨)
+    - selectinload 로 조항/용어를 문서 조회 직후 IN 쿼리 한 번씩에 로딩
+    """
+    result = await db.execute(
+        select(Document)
+        .options(
+            selectinload(Document.clauses),
+            selectinload(Document.terms),
+        )
+        .where(
+            Document.id == document_id,
+            Document.user_id == current_user.id,
+        )
+    )
+    doc = result.scalar_one_or_none()
+
+    if not doc:
+        raise HTTPException(404, "문서를 찾을 수 없습니다.")
+
+    return DocumentFull(
+        **_document_detail(doc).model_dump(),
+        clauses=[ClauseItem.model_validate(c) for c in doc.clauses],
+        terms=[TermItem.model_validate(t) for t in doc.terms],
+    )
+
+
 # =============================================
-# 4) 문서 조항 목록 조회 API
+# 4) 문서 조항 목록 조회 API (deprecated → /{document_id}/full)
 # =============================================
-@router.get("/{document_id}/clauses")
+@router.get("/{document_id}/clauses", response_model=List[ClauseItem], deprecated=True)
 def get_document_clauses(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     # 문서 검증
-    doc = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    doc = _get_owned_document(db, document_id, current_user.id)
     if not doc:
         raise HTTPException(404, "문서를 찾을 수 없습니다.")
 
@@ -170,33 +372,20 @@ def get_document_clauses(
         Clause.document_id == document_id
     ).order_by(Clause.id).all()
 
-    return [
-        {
-            "id": c.id,
-            "clause_id": c.clause_id,
-            "title": c.title,
-            "summary": c.summary,
-            "risk_level": c.risk_level,
-            "risk_score": c.risk_score,
-        }
-        for c in clauses
-    ]
+    return [ClauseItem.model_validate(c) for c in clauses]
 
 
 # =============================================
-# 5) 문서 용어 목록 조회 API
+# 5) 문서 용어 목록 조회 API (deprecated → /{document_id}/full)
 # =============================================
-@router.get("/{document_id}/terms")
+@router.get("/{document_id}/terms", response_model=List[TermItem], deprecated=True)
 def get_document_terms(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
 
-    doc = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    doc = _get_owned_document(db, document_id, current_user.id)
     if not doc:
         raise HTTPException(404, "문서를 찾을 수 없습니다.")
 
@@ -204,15 +393,7 @@ def get_document_terms(
         Term.document_id == document_id
     ).order_by(Term.id).all()
 
-    return [
-        {
-            "term": t.term,
-            "korean": t.korean,
-            "english": t.english,
-            "source": t.source,
-        }
-        for t in terms
-    ]
+    return [TermItem.model_validate(t) for t in terms]
 
 
 # =============================================
@@ -224,17 +405,14 @@ def delete_contract(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    doc = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    doc = _get_owned_document(db, document_id, current_user.id)
 
     if not doc:
         raise HTTPException(404, "문서를 찾을 수 없습니다.")
 
-    # 자식 데이터 삭제
-    db.query(Clause).filter(Clause.document_id == document_id).delete()
-    db.query(Term).filter(Term.document_id == document_id).delete()
+    # 기존 DB(CASCADE 없이 생성된 테이블)도 고려해 자식은 명시적으로 일괄 삭제
+    db.query(Clause).filter(Clause.document_id == document_id).delete(synchronize_session=False)
+    db.query(Term).filter(Term.document_id == document_id).delete(synchronize_session=False)
 
     db.delete(doc)
     db.commit()
@@ -251,10 +429,7 @@ def toggle_favorite(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    doc = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id,
-    ).first()
+    doc = _get_owned_document(db, document_id, current_user.id)
 
     if not doc:
         raise HTTPException(404, "문서를 찾을 수 없습니다.")
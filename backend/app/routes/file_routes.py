@@ -3,9 +3,13 @@ import json
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from sqlalchemy.orm import Session
 from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 
-from app.db.database import SessionLocal
-from app.services.document_service import save_document_from_analysis, save_document
+from app.services.document_service import (
+    build_answer_markdown,
+    save_document_from_analysis,
+    save_document,
+)
 
 # 🔥 FIX: 올바른 extractor import
 from app.services.extractor import extract_text_from_file
@@ -13,8 +17,7 @@ from app.services.extractor import extract_text_from_file
 from app.services.llm import analyze_contract
 from app.models.legal import DocumentResult
 from app.routes.legal import InterpretResponse
-from app.nlp.extractor import build_nlp_info
-from app.services.law_api import fetch_term_definitions
+from app.services.analysis import prepare_contract_inputs
 from app.db.models import User
 
 import google.generativeai as genai
@@ -27,38 +30,37 @@ router = APIRouter(
     tags=["files"],
 )
 
-
-# ---------------------------------------------------------
-# DB 종속성
-# ---------------------------------------------------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# 스트리밍 분석용 모델/설정은 요청마다 만들지 않고 모듈에서 한 번만 생성
+_GEMINI_FLASH = genai.GenerativeModel("gemini-2.0-flash")
+STREAM_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "max_output_tokens": 4096,
+}
 
 
 # ---------------------------------------------------------
 # STREAMING LLM 분석
 # ---------------------------------------------------------
+def _ndjson_line(payload: dict) -> bytes:
+    # 미리 bytes 로 인코딩해서 넘기면 Starlette 가 청크마다 다시 인코딩하지 않음
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+
 @router.post("/interpret-stream")
 async def interpret_stream(
     file: UploadFile = File(...),
     language: str = Form("ko"),      # 🔥 프론트에서 보내는 언어
-    db: Session = Depends(get_db),
 ):
     try:
         text = await extract_text_from_file(file)
     except ValueError as e:
-        return StreamingResponse(iter([f"error: {str(e)}"]), media_type="text/plain")
+        # 성공 응답과 같은 NDJSON 형식 → 클라이언트가 같은 파서로 에러를 처리
+        return StreamingResponse(
+            iter([_ndjson_line({"stage": "error", "message": str(e)})]),
+            media_type="application/x-ndjson",
+        )
 
-    nlp_info = build_nlp_info(text, language_hint=language)
-
-    try:
-        term_map = await fetch_term_definitions(nlp_info.candidate_terms)
-    except Exception:
-        term_map = {}
+    nlp_info, term_map = await prepare_contract_inputs(text, language_hint=language)
 
     # 🔥 언어 반영된 프롬프트 생성
     prompt = build_contract_analysis_prompt(
@@ -68,39 +70,40 @@ async def interpret_stream(
         output_language=language,   # ★ 추가
     )
 
-    model = genai.GenerativeModel("gemini-2.0-flash")
-
     async def event_generator():
 
-        yield json.dumps({"stage": "start", "message": "LLM 분석 시작"}) + "\n"
+        yield _ndjson_line({"stage": "start", "message": "LLM 분석 시작"})
 
         try:
-            response = model.generate_content(
+            # async 스트림 → 토큰 사이에 이벤트 루프를 막지 않음
+            response = await _GEMINI_FLASH.generate_content_async(
                 prompt,
                 stream=True,
-                generation_config={
-                    "temperature": 0.2,
-                    "max_output_tokens": 4096,
-                },
+                generation_config=STREAM_GENERATION_CONFIG,
             )
 
             async for chunk in response:
-                if hasattr(chunk, "text"):
-                    yield json.dumps({
+                try:
+                    text_chunk = chunk.text
+                except ValueError:
+                    # 텍스트 파트가 없는 청크 (finish_reason 만 있는 경우 등)
+                    continue
+                if text_chunk:
+                    yield _ndjson_line({
                         "stage": "chunk",
-                        "content": chunk.text,
-                    }) + "\n"
+                        "content": text_chunk,
+                    })
 
         except Exception as e:
-            yield json.dumps({
+            yield _ndjson_line({
                 "stage": "error",
                 "message": str(e),
-            }) + "\n"
+            })
             return
 
-        yield json.dumps({"stage": "done"}) + "\n"
+        yield _ndjson_line({"stage": "done"})
 
-    return StreamingResponse(event_generator(), media_type="text/plain")
+    return StreamingResponse(event_generator(), media_type="application/x-ndjson")
 
 
 # ---------------------------------------------------------
@@ -138,12 +141,7 @@ async def interpret_file(
     if not text.strip():
         raise HTTPException(400, "파일에서 텍스트가 없습니다.")
 
-    nlp_info = build_nlp_info(text, language_hint=language)
-
-    try:
-        term_map = await fetch_term_definitions(nlp_info.candidate_terms)
-    except Exception:
-        term_map = {}
+    nlp_info, term_map = await prepare_contract_inputs(text, language_hint=language)
 
     # 🔥 언어 반영된 LLM 분석
     document: DocumentResult = await analyze_contract(
@@ -155,18 +153,17 @@ async def interpret_file(
 
     summary_text = document.summary.overall_summary or "요약 없음"
 
-    answer_markdown = (
-        "```json\n"
-        + json.dumps(document.dict(), indent=2, ensure_ascii=False)
-        + "\n```"
-    )
+    answer_markdown = build_answer_markdown(document)
 
-    saved = save_document_from_analysis(
+    # 응답에 문서 ID 가 필요하므로 기다리되, 동기 커밋은 스레드풀에서 실행
+    saved = await run_in_threadpool(
+        save_document_from_analysis,
         db=db,
         user_id=current_user.id,
         original_text=text,
         summary=summary_text,
         answer_markdown=answer_markdown,
+        language=language,
     )
 
     document.document_id = str(saved.id)
@@ -193,14 +190,8 @@ async def full_interpret(
     if not text.strip():
         raise HTTPException(400, "파일에서 텍스트를 추출하지 못했습니다.")
 
-    # 2) NLP 분석
-    nlp_info = build_nlp_info(text, language_hint=language)
-
-    # 3) 법령 용어 정의 조회
-    try:
-        term_map = await fetch_term_definitions(nlp_info.candidate_terms)
-    except Exception:
-        term_map = {}
+    # 2) NLP 분석(스레드) + 3) 법령 용어 정의 조회
+    nlp_info, term_map = await prepare_contract_inputs(text, language_hint=language)
 
     # 4) LLM 계약서 분석
     document: DocumentResult = await analyze_contract(
@@ -210,8 +201,9 @@ async def full_interpret(
         output_language=language,
     )
 
-    # 5) DB에 전체 저장 (🔥 핵심 변경 부분)
-    saved = save_document(
+    # 5) DB에 전체 저장 (🔥 핵심 변경 부분, 동기 커밋은 스레드풀에서)
+    saved = await run_in_threadpool(
+        save_document,
         db=db,
         analysis=document,
         file_name=file.filename,
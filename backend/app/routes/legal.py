@@ -1,20 +1,22 @@
 # backend/app/routes/legal.py
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
 from pydantic import BaseModel, Field
 from typing import Optional
-import json
 import secrets
 
 # DB / 서비스 의존성
 from app.db.database import SessionLocal
-from app.services.document_service import save_document_from_analysis
+from app.services.document_service import build_answer_markdown, save_document_from_analysis_task
 
 # 모델 + NLP + LLM
 from app.models.legal import DocumentResult
-from app.nlp.extractor import build_nlp_info
-from app.services.law_api import fetch_term_definitions
+from app.services.analysis import prepare_contract_inputs
 from app.services.llm import analyze_contract, generate_legal_answer_multilang
 
 # DB 모델
@@ -38,17 +40,6 @@ class InterpretResponse(BaseModel):
     document: Optional[DocumentResult] = None
 
 
-# -----------------------------------------------------
-# 📌 DB 의존성
-# -----------------------------------------------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # -----------------------------------------------------
 # 📌 핵심 기능: 계약서 해석 + DB 저장
 # -----------------------------------------------------
@@ -56,21 +47,18 @@ def get_db():
 async def interpret_contract(
     req: InterpretRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     text = req.text.strip()
     if not text:
         raise HTTPException(status_code=400, detail="분석할 텍스트가 비어 있습니다.")
 
-    # 1) NLP 처리
-    nlp_info = build_nlp_info(
+    # 1) NLP 처리(스레드) + 2) 용어 정의 조회
+    nlp_info, term_map = await prepare_contract_inputs(
         text,
         language_hint=req.language,
-        force_language=req.language
+        force_language=req.language,
     )
-    # 2) 용어 정의 조회
-    term_map = await fetch_term_definitions(nlp_info.candidate_terms)
 
     # 3) LLM 분석
     document: DocumentResult = await analyze_contract(
@@ -85,19 +73,19 @@ async def interpret_contract(
     summary_text = document.summary.overall_summary if document.summary else "요약 없음"
 
     # Markdown 저장용 JSON
-    answer_markdown = "```json\n" + json.dumps(document.dict(), indent=2, ensure_ascii=False) + "\n```"
+    answer_markdown = build_answer_markdown(document)
 
-    # 5) DB 저장
-    saved = save_document_from_analysis(
-        db=db,
+    # 5) DB 저장 → 응답에 문서 ID 가 필요 없으므로 응답 후 백그라운드에서 새 세션으로 저장
+    background_tasks.add_task(
+        save_document_from_analysis_task,
+        SessionLocal,
         user_id=current_user.id,
         original_text=text,
         summary=summary_text,
         answer_markdown=answer_markdown,
+        language=req.language or "ko",
     )
 
-    print("📌 Document Saved:", saved.id)
-
     return InterpretResponse(document=document)
 
 
@@ -110,21 +98,26 @@ class AskRequest(BaseModel):
     language: Optional[str] = "ko"
 
 
+def _commit_and_refresh(db: Session, obj) -> None:
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+
+
 @router.post("/ask")
 async def ask_legal_question(
     req: AskRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    # 동기 DB 커밋은 스레드풀에서 실행 → 이벤트 루프(다른 요청)를 막지 않음
     conversation = Conversation(
         user_id=current_user.id,
         question=req.text,
         language=req.language or "ko",
         status="pending",
     )
-    db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
+    await run_in_threadpool(_commit_and_refresh, db, conversation)
 
     try:
         answer = await generate_legal_answer_multilang(
@@ -133,13 +126,12 @@ async def ask_legal_question(
         )
         conversation.answer = answer
         conversation.status = "completed"
-        db.commit()
-        db.refresh(conversation)
+        await run_in_threadpool(_commit_and_refresh, db, conversation)
 
     except Exception as e:
         conversation.status = "error"
         conversation.answer = f"Error: {str(e)}"
-        db.commit()
+        await run_in_threadpool(db.commit)
         raise HTTPException(status_code=500, detail=str(e))
 
     return conversation
@@ -153,7 +145,14 @@ def get_history(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return db.query(Conversation).filter(
+    # 목록에는 answer(대용량 TEXT)를 싣지 않음 → 상세는 /conversation/{id} 로 조회
+    return db.query(Conversation).options(load_only(
+        Conversation.id,
+        Conversation.question,
+        Conversation.status,
+        Conversation.language,
+        Conversation.created_at,
+    )).filter(
         Conversation.user_id == current_user.id
     ).order_by(Conversation.created_at.desc()).limit(100).all()
 
@@ -194,13 +193,17 @@ def toggle_bookmark(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    bookmark = db.query(Bookmark).filter(
-        Bookmark.user_id == current_user.id,
-        Bookmark.conversation_id == req.conversation_id,
+    # 먼저 삭제를 시도하고(RETURNING), 지운 행이 없을 때만 추가 → 사전 SELECT 없음
+    removed = db.execute(
+        delete(Bookmark)
+        .where(
+            Bookmark.user_id == current_user.id,
+            Bookmark.conversation_id == req.conversation_id,
+        )
+        .returning(Bookmark.id)
     ).first()
 
-    if bookmark:
-        db.delete(bookmark)
+    if removed:
         db.commit()
         return {"message": "북마크 제거", "is_bookmarked": False}
     else:
@@ -219,27 +222,38 @@ class ShareLinkCreate(BaseModel):
     conversation_id: int
 
 
+SHARE_TOKEN_ATTEMPTS = 3
+
+
 @router.post("/create-share-link")
 def create_share_link(req: ShareLinkCreate, db: Session = Depends(get_db)):
-    conversation = db.query(Conversation).filter(
-        Conversation.id == req.conversation_id
-    ).first()
-
-    if not conversation:
-        raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다")
+    # UPSERT 한 문장으로 기존 토큰 또는 새 토큰을 돌려받음
+    # (충돌 시 token 을 자기 자신으로 갱신해 RETURNING 이 기존 행을 반환하도록 함)
+    for _ in range(SHARE_TOKEN_ATTEMPTS):
+        stmt = (
+            sqlite_insert(ShareLink)
+            .values(conversation_id=req.conversation_id, token=secrets.token_urlsafe(16))
+            .on_conflict_do_update(
+                index_elements=[ShareLink.conversation_id],
+                set_={"token": ShareLink.token},
+            )
+            .returning(ShareLink.token)
+        )
 
-    existing = db.query(ShareLink).filter(
-        ShareLink.conversation_id == req.conversation_id
-    ).first()
+        try:
+            token = db.execute(stmt).scalar_one()
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            # 없는 대화 ID → FK 위반 (PRAGMA foreign_keys=ON)
+            if db.get(Conversation, req.conversation_id) is None:
+                raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다")
+            # 대화는 있음 → 다른 링크와 토큰이 겹침 → 새 토큰으로 재시도
+            continue
 
-    if existing:
-        token = existing.token
-    else:
-        token = secrets.token_urlsafe(16)
-        db.add(ShareLink(conversation_id=req.conversation_id, token=token))
-        db.commit()
+        return {"token": token, "url": f"http://localhost:5173/shared/{token}"}
 
-    return {"token": token, "url": f"http://localhost:5173/shared/{token}"}
+    raise HTTPException(status_code=500, detail="공유 링크 생성에 실패했습니다")
 
 
 @router.get("/shared/{token}")
@@ -249,9 +263,7 @@ def get_shared(token: str, db: Session = Depends(get_db)):
     if not link:
         raise HTTPException(status_code=404, detail="공유 링크를 찾을 수 없습니다")
 
-    return db.query(Conversation).filter(
-        Conversation.id == link.conversation_id
-    ).first()
+    return db.get(Conversation, link.conversation_id)
 
 
 # -----------------------------------------------------
@@ -263,12 +275,9 @@ def get_conversation(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    conv = db.query(Conversation).filter(
-        Conversation.id == conversation_id,
-        Conversation.user_id == current_user.id,
-    ).first()
+    conv = db.get(Conversation, conversation_id)   # PK 조회 (identity map 우선)
 
-    if not conv:
+    if not conv or conv.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다")
 
     return conv
@@ -280,12 +289,9 @@ def delete_conversation(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    conv = db.query(Conversation).filter(
-        Conversation.id == conversation_id,
-        Conversation.user_id == current_user.id,
-    ).first()
+    conv = db.get(Conversation, conversation_id)
 
-    if not conv:
+    if not conv or conv.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다")
 
     db.delete(conv)
@@ -0,0 +1,48 @@
+# backend/app/services/analysis.py
+"""
+계약서 분석 전처리 공용 헬퍼 (NLP + 법제처 용어 조회)
+
+- build_nlp_info 는 CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서 실행
+- 후보 용어만 먼저 뽑아 법제처 조회(I/O)를 나머지 NLP 와 동시에 진행
+- 여러 문서를 처리할 때는 asyncio.gather 로 문서별 전처리를 동시에 돌릴 수 있다
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from app.models.legal import TermDefinition
+from app.nlp.extractor import NLPInfo, build_nlp_info, extract_candidate_terms
+from app.services.law_api import fetch_term_definitions
+
+
+async def prepare_contract_inputs(
+    text: str,
+    language_hint: Optional[str] = None,
+    force_language: Optional[str] = None,
+) -> Tuple[NLPInfo, Dict[str, TermDefinition]]:
+    """
+    후보 용어 추출 → 법제처 정의 조회와 NLP 분석(스레드)을 동시에 실행.
+    용어 조회 실패는 빈 dict 로 처리한다.
+    """
+    candidate_terms = await asyncio.to_thread(extract_candidate_terms, text)
+
+    nlp_info, term_map = await asyncio.gather(
+        asyncio.to_thread(
+            build_nlp_info,
+            text,
+            language_hint=language_hint,
+            force_language=force_language,
+            candidate_terms=candidate_terms,
+        ),
+        _fetch_terms(candidate_terms),
+    )
+    return nlp_info, term_map
+
+
+async def _fetch_terms(terms: List[str]) -> Dict[str, TermDefinition]:
+    try:
+        return await fetch_term_definitions(terms)
+    except Exception:
+        return {}
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 
+from app.core.logger import logger
+
 # DB 테이블
 from app.db.models import Document
 from app.db.legal import Clause, Term
@@ -13,6 +18,17 @@ from app.db.legal import Clause, Term
 from app.models.legal import DocumentResult
 
 
+# ======================================================================================
+# 0) answer_markdown 생성 (분석 결과 JSON 코드블록)
+# ======================================================================================
+def build_answer_markdown(document: DocumentResult) -> str:
+    """
+    DocumentResult → ```json 코드블록 문자열 (orjson 으로 직렬화, DB TEXT 컬럼용으로 한 번만 decode)
+    """
+    body = orjson.dumps(document.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+    return (b"```json\n" + body + b"\n```").decode("utf-8")
+
+
 # ======================================================================================
 # 1) 간단한 Q&A 저장 (기존 기능)
 # ======================================================================================
@@ -40,6 +56,21 @@ def save_document_from_analysis(
     return doc
 
 
+def save_document_from_analysis_task(session_factory: Callable[[], Session], **kwargs) -> None:
+    """
+    🔵 BackgroundTasks 용: 요청 스코프 세션 대신 새 세션을 열어 저장 후 닫는다
+    """
+    db = session_factory()
+    try:
+        saved = save_document_from_analysis(db=db, **kwargs)
+        logger.info(f"📌 Document Saved: {saved.id}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Document 저장 실패: {e}")
+    finally:
+        db.close()
+
+
 # ======================================================================================
 # 2) 전체 계약 분석 저장 (Document + Clause + Term)
 # ======================================================================================
@@ -66,55 +97,153 @@ def save_document(
     # ---------------------------
     doc = Document(
         user_id=user_id,
-        title=analysis.summary.title or file_name,
         original_text="",  # 필요하면 OCR 텍스트 저장 가능
-        summary=analysis.summary.overall_summary,
         answer_markdown="",
-
-        # ---- 메타 ---
-        language=lang,
-        parties=",".join(analysis.meta.parties or []),
-        domain_tags=",".join(analysis.meta.domain_tags or []),
-
-        # ---- 리스크 ---
-        risk_level=analysis.risk_profile.overall_risk_level,
-        risk_score=analysis.risk_profile.overall_risk_score,
     )
+    _apply_analysis(doc, analysis, file_name, lang)
 
     db.add(doc)
+    db.flush()   # doc.id 확보 (커밋은 자식까지 넣은 뒤 한 번만)
+
+    _add_clauses_and_terms(db, doc.id, analysis)
+
     db.commit()
     db.refresh(doc)
+    return doc
+
+
+def _analysis_values(analysis: DocumentResult, file_name: str, lang: str) -> dict:
+    return {
+        "title": analysis.summary.title or file_name,
+        "summary": analysis.summary.overall_summary,
+
+        # ---- 메타 ---
+        "language": lang,
+        "parties": ",".join(analysis.meta.parties or []),
+        "domain_tags": ",".join(analysis.meta.domain_tags or []),
 
+        # ---- 리스크 ---
+        "risk_level": analysis.risk_profile.overall_risk_level,
+        "risk_score": analysis.risk_profile.overall_risk_score,
+    }
+
+
+def _apply_analysis(doc: Document, analysis: DocumentResult, file_name: str, lang: str) -> None:
+    for name, value in _analysis_values(analysis, file_name, lang).items():
+        setattr(doc, name, value)
+
+
+def _add_clauses_and_terms(db: Session, document_id: int, analysis: DocumentResult) -> None:
+    # 행 단위 db.add 대신 테이블당 executemany INSERT 한 번
     # ---------------------------
     # Clause 저장
     # ---------------------------
-    for c in analysis.clauses:
-        clause = Clause(
-            document_id=doc.id,
-            clause_id=c.clause_id,
-            title=c.title,
-            raw_text=c.raw_text,
-            summary=c.summary,
-            risk_level=c.risk_level,
-            risk_score=c.risk_score,
-        )
-        db.add(clause)
+    clause_rows = [
+        {
+            "document_id": document_id,
+            "clause_id": c.clause_id,
+            "title": c.title,
+            "raw_text": c.raw_text,
+            "summary": c.summary,
+            "risk_level": c.risk_level,
+            "risk_score": c.risk_score,
+        }
+        for c in analysis.clauses
+    ]
+    if clause_rows:
+        db.execute(insert(Clause), clause_rows)
 
     # ---------------------------
     # Term 저장
     # ---------------------------
-    for t in analysis.terms:
-        term = Term(
-            document_id=doc.id,
-            term=t.term,
-            korean=t.korean,
-            english=t.english,
-            source=t.source,
+    term_rows = [
+        {
+            "document_id": document_id,
+            "term": t.term,
+            "korean": t.korean,
+            "english": t.english,
+            "source": t.source,
+        }
+        for t in analysis.terms
+    ]
+    if term_rows:
+        db.execute(insert(Term), term_rows)
+
+
+# ======================================================================================
+# 2-1) Batch 분석용 대기 문서 생성 / 결과 반영
+# ======================================================================================
+def create_pending_documents(
+    db: Session,
+    user_id: int,
+    contracts: List[Tuple[str, str, str]],
+) -> List[int]:
+    """
+    🟠 Batch 결과가 도착하기 전까지 자리만 잡아두는 문서들 (summary 가 비어 있음)
+    contracts: (original_text, file_name, language) 목록 → 생성된 문서 id 목록
+
+    Batch 제출(수 초짜리 업로드) 전에 바로 커밋해서 쓰기 잠금을 오래 잡지 않는다.
+    """
+    docs = [
+        Document(
+            user_id=user_id,
+            title=file_name,
+            original_text=original_text,
+            answer_markdown="",
+            language=language,
         )
-        db.add(term)
+        for original_text, file_name, language in contracts
+    ]
+    db.add_all(docs)
+    db.flush()
+    ids = [d.id for d in docs]
+    db.commit()
+    return ids
+
 
+def attach_batch_job(db: Session, document_ids: List[int], job_name: str) -> None:
+    db.execute(
+        update(Document)
+        .where(Document.id.in_(document_ids))
+        .values(batch_job=job_name)
+    )
     db.commit()
-    return doc
+
+
+def discard_pending_documents(db: Session, document_ids: List[int]) -> None:
+    """Batch 제출 실패 시 아직 결과가 없는 대기 문서만 삭제"""
+    db.execute(
+        delete(Document)
+        .where(Document.id.in_(document_ids), Document.summary.is_(None))
+    )
+    db.commit()
+
+
+def complete_pending_document(
+    db: Session,
+    document_id: int,
+    file_name: str,
+    language: str,
+    analysis: DocumentResult,
+) -> bool:
+    """
+    🟠 Batch 결과로 대기 문서를 채우고 Clause/Term 을 저장
+
+    같은 Batch 를 동시에 폴링해도 한 번만 저장되도록 summary IS NULL 조건부 UPDATE 로 선점하고,
+    이미 다른 요청이 채웠으면(갱신 0건) 자식 행을 넣지 않고 False 를 돌려준다.
+    """
+    result = db.execute(
+        update(Document)
+        .where(Document.id == document_id, Document.summary.is_(None))
+        .values(**_analysis_values(analysis, file_name, language))
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        return False
+
+    _add_clauses_and_terms(db, document_id, analysis)
+    db.commit()
+    return True
 
 
 # ======================================================================================
@@ -159,8 +288,9 @@ def delete_document(db: Session, document_id: int, user_id: Optional[int] = None
     if not doc:
         return False
 
-    db.query(Clause).filter(Clause.document_id == document_id).delete()
-    db.query(Term).filter(Term.document_id == document_id).delete()
+    # 기존 DB(CASCADE 없이 생성된 테이블)도 고려해 자식은 명시적으로 일괄 삭제
+    db.query(Clause).filter(Clause.document_id == document_id).delete(synchronize_session=False)
+    db.query(Term).filter(Term.document_id == document_id).delete(synchronize_session=False)
 
     db.delete(doc)
     db.commit()
@@ -2,17 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import io
 import os
+import shutil
 import tempfile
-from typing import Final
+from typing import Final, Optional
 
 from fastapi import UploadFile
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_path
 from docx import Document
 from google.cloud import vision
 from PIL import Image
 
+from app.core.logger import logger
+
 
 # MIME 타입들
 IMAGE_TYPES: Final[set[str]] = {"image/png", "image/jpeg", "image/jpg"}
@@ -21,30 +25,103 @@ DOCX_TYPES: Final[set[str]] = {
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 }
 
+# 업로드 읽기 단위 (100 KiB)
+UPLOAD_CHUNK_SIZE: Final[int] = 100 * 1024
+
+# 이 크기까지는 메모리에 두고, 넘으면 디스크 임시파일로 넘김
+UPLOAD_SPOOL_MAX_SIZE: Final[int] = 2 * 1024 * 1024
+
+# PDF 페이지 OCR 동시 처리 수
+OCR_CONCURRENCY: Final[int] = 4
+
 
 # ----------------------------------------
 # Google Vision OCR 함수
 # ----------------------------------------
+_vision_client: Optional[vision.ImageAnnotatorClient] = None
+
+
+def _get_vision_client() -> vision.ImageAnnotatorClient:
+    # gRPC 채널 생성 비용이 커서 프로세스당 하나만 만들어 재사용 (스레드 안전)
+    global _vision_client
+    if _vision_client is None:
+        _vision_client = vision.ImageAnnotatorClient()
+    return _vision_client
+
+
 def google_vision_ocr(img_bytes: bytes) -> str:
     """
     Google Vision OCR로 문자열 추출 (가장 정확함)
     """
     try:
-        client = vision.ImageAnnotatorClient()
+        client = _get_vision_client()
         image = vision.Image(content=img_bytes)
         response = client.text_detection(image=image)
 
         if response.error.message:
-            print("❌ Vision API Error:", response.error.message)
+            logger.error("❌ Vision API Error: %s", response.error.message)
             return ""
 
         return response.full_text_annotation.text or ""
 
     except Exception as e:
-        print("❌ Vision OCR Exception:", e)
+        logger.error("❌ Vision OCR Exception: %s", e)
         return ""
 
 
+def _ocr_pdf_page(page: Image.Image) -> str:
+    img_byte_arr = io.BytesIO()
+    page.save(img_byte_arr, format="PNG")
+    return google_vision_ocr(img_byte_arr.getvalue())
+
+
+async def _ocr_pdf_pages(pages: list) -> str:
+    """
+    페이지별 PNG 인코딩 + OCR 을 스레드에서 동시에 실행 (페이지 순서는 유지)
+    """
+    sem = asyncio.Semaphore(OCR_CONCURRENCY)
+
+    async def _one(page) -> str:
+        async with sem:
+            return await asyncio.to_thread(_ocr_pdf_page, page)
+
+    page_texts = await asyncio.gather(*(_one(p) for p in pages))
+    return "".join(t + "\n" for t in page_texts)
+
+
+def _spool_upload(file: UploadFile) -> tempfile.SpooledTemporaryFile:
+    """
+    업로드 스트림을 SpooledTemporaryFile 로 복사 (작은 파일은 메모리, 큰 파일은 디스크).
+    파일 전체를 bytes 로 힙에 올리지 않는다.
+    """
+    buf = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE)
+    file.file.seek(0)
+    shutil.copyfileobj(file.file, buf, UPLOAD_CHUNK_SIZE)
+    buf.seek(0)
+    return buf
+
+
+def _pdf_to_images(file: UploadFile) -> list:
+    """
+    PDF 는 경로 기반 변환(pdftoppm 이 직접 읽음)을 위해 이름 있는 임시파일로 복사
+    """
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            file.file.seek(0)
+            shutil.copyfileobj(file.file, out, UPLOAD_CHUNK_SIZE)
+        return convert_from_path(path, dpi=300)  # 고해상도로 변환
+    finally:
+        os.remove(path)
+
+
+def _decode_text(raw_bytes: bytes) -> str:
+    try:
+        return raw_bytes.decode("utf-8", errors="ignore")
+    except:
+        return raw_bytes.decode("cp949", errors="ignore")
+
+
 # ----------------------------------------
 # 메인 파일 텍스트 추출 함수
 # ----------------------------------------
@@ -56,64 +133,55 @@ async def extract_text_from_file(file: UploadFile) -> str:
 
     filename = file.filename or ""
     content_type = file.content_type or ""
-    raw_bytes: bytes = await file.read()
-
-    # 1) Plain Text
-    if content_type.startswith("text/"):
-        try:
-            return raw_bytes.decode("utf-8", errors="ignore")
-        except:
-            return raw_bytes.decode("cp949", errors="ignore")
 
-    # 2) PDF → 모든 PDF 이미 OCR 처리
+    # 2) PDF → 모든 PDF 이미 OCR 처리 (메모리에 올리지 않고 임시파일 경로로 변환)
     if content_type in PDF_TYPES or filename.lower().endswith(".pdf"):
         try:
-            pages = convert_from_bytes(raw_bytes, dpi=300)  # 고해상도로 변환
+            # 복사 + 래스터화는 블로킹/CPU 작업 → 이벤트 루프 밖에서 실행
+            pages = await asyncio.to_thread(_pdf_to_images, file)
         except Exception as e:
             raise ValueError(f"❌ PDF 변환 오류: {e}")
 
-        extracted_text = ""
-
-        for page in pages:
-            img_byte_arr = io.BytesIO()
-            page.save(img_byte_arr, format="PNG")
-            img_bytes = img_byte_arr.getvalue()
-
-            page_text = google_vision_ocr(img_bytes)
-            extracted_text += page_text + "\n"
+        extracted_text = await _ocr_pdf_pages(pages)
 
         return extracted_text or ""
 
-    # 3) DOCX
-    if content_type in DOCX_TYPES or filename.lower().endswith(".docx"):
-        try:
-            with io.BytesIO(raw_bytes) as f:
-                doc = Document(f)
-            return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-        except Exception as e:
-            raise ValueError(f"❌ DOCX 읽기 오류: {e}")
-
-    # 4) HWP 안내
-    if filename.lower().endswith(".hwp"):
-        raise ValueError(
-            "❌ HWP 파일은 직접 추출 불가합니다.\n"
-            "한글 프로그램에서 PDF 또는 HWPX로 변환 후 업로드해 주세요."
-        )
-
-    # 5) 이미지 → Vision OCR
-    if (
-        content_type in IMAGE_TYPES
-        or filename.lower().endswith((".png", ".jpg", ".jpeg"))
-    ):
-        try:
-            img = Image.open(io.BytesIO(raw_bytes)).convert("RGB")
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format="PNG")
-            img_bytes = img_byte_arr.getvalue()
-        except:
-            raise ValueError("❌ 이미지 파일 로드 오류")
-
-        return google_vision_ocr(img_bytes)
+    # 나머지 형식은 2MB 까지 메모리, 그 이상은 디스크로 스풀
+    with await asyncio.to_thread(_spool_upload, file) as buf:
+
+        # 1) Plain Text
+        if content_type.startswith("text/"):
+            return _decode_text(buf.read())
+
+        # 3) DOCX
+        if content_type in DOCX_TYPES or filename.lower().endswith(".docx"):
+            try:
+                doc = Document(buf)
+                return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+            except Exception as e:
+                raise ValueError(f"❌ DOCX 읽기 오류: {e}")
+
+        # 4) HWP 안내
+        if filename.lower().endswith(".hwp"):
+            raise ValueError(
+                "❌ HWP 파일은 직접 추출 불가합니다.\n"
+                "한글 프로그램에서 PDF 또는 HWPX로 변환 후 업로드해 주세요."
+            )
+
+        # 5) 이미지 → Vision OCR
+        if (
+            content_type in IMAGE_TYPES
+            or filename.lower().endswith((".png", ".jpg", ".jpeg"))
+        ):
+            try:
+                img = Image.open(buf).convert("RGB")
+                img_byte_arr = io.BytesIO()
+                img.save(img_byte_arr, format="PNG")
+                img_bytes = img_byte_arr.getvalue()
+            except:
+                raise ValueError("❌ 이미지 파일 로드 오류")
+
+            return await asyncio.to_thread(google_vision_ocr, img_bytes)
 
     # 6) 기타 확장자
     raise ValueError(
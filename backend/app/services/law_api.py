@@ -1,19 +1,77 @@
 # backend/app/services/law_api.py
 
 import asyncio
-import json
 from typing import Dict, List, Optional
 
 import aiohttp
 
+from app.core.cache import term_cache
 from app.core.config import settings
+from app.core.resilience import CircuitBreaker, retry_async
 from app.models.legal import TermDefinition
+from app.services.llm_cache import llm_cache, make_cache_key
 
 
 BASE_URL = "http://www.law.go.kr/DRF/lawService.do"
+TERM_CACHE_TTL = 60 * 60 * 24   # 법령 용어 정의는 자주 바뀌지 않음
+TERM_MISS_TTL = 60 * 60         # 정의 없음은 짧게만 기억 (일시 장애는 캐시하지 않음)
+MAX_CONCURRENT_REQUESTS = 10    # 법제처 API 동시 요청 상한
+
+
+# 요청마다 세션을 새로 열지 않고 프로세스 전체에서 keep-alive 커넥션을 재사용
+_session: Optional[aiohttp.ClientSession] = None
+_SEM = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, limit_per_host=10, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return _session
+
+
+async def close_session() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+class _RetryableStatus(Exception):
+    """법제처 API 가 429/5xx 로 응답 (잠시 후 다시 시도할 만한 상태)"""
+
+
+MOLEG_RETRY_STATUSES = {429, 500, 502, 503, 504}
+MOLEG_RETRYABLE = (aiohttp.ClientError, asyncio.TimeoutError, _RetryableStatus)
+
+# 법제처 장애 중에는 용어마다 재시도하지 않고 바로 "정의 없음" 처리
+moleg_breaker = CircuitBreaker("법제처 API", fail_max=10, reset_timeout=30)
+
+
+async def _request_term(session: aiohttp.ClientSession, params: dict) -> Optional[dict]:
+    async with _SEM, session.get(BASE_URL, params=params) as resp:
+        if resp.status in MOLEG_RETRY_STATUSES:
+            raise _RetryableStatus(resp.status)
+        if resp.status != 200:
+            return None
+
+        try:
+            return await resp.json(content_type=None)
+        except Exception:
+            # 응답이 깨지는 경우 텍스트로 확인 후 패스
+            _ = await resp.text()
+            return None
 
 
 async def _fetch_single_term(session: aiohttp.ClientSession, term: str) -> Optional[TermDefinition]:
+    """
+    법제처가 실제로 응답했는데 정의가 없으면 None.
+    브레이커 열림(CircuitOpenError) / 재시도 소진 등 일시 장애는 예외로 그대로 올려
+    호출부가 "정의 없음"으로 캐시하지 않도록 한다.
+    """
     if not settings.MOLEG_API_KEY:
         return None
 
@@ -24,64 +82,121 @@ async def _fetch_single_term(session: aiohttp.ClientSession, term: str) -> Optio
         "type": "JSON",
     }
 
-    try:
-        async with session.get(BASE_URL, params=params, timeout=5) as resp:
-            if resp.status != 200:
-                return None
+    # 용어 정의는 부가 정보라 Gemini 보다 재시도 횟수를 줄임
+    data = await retry_async(
+        lambda: _request_term(session, params),
+        retry_on=MOLEG_RETRYABLE,
+        breaker=moleg_breaker,
+        attempts=3,
+        max_wait=2.0,
+    )
 
-            try:
-                data = await resp.json(content_type=None)
-            except Exception:
-                # 응답이 깨지는 경우 텍스트로 확인 후 패스
-                _ = await resp.text()
-                return None
+    try:
+        if not data:
+            return None
 
-            service = data.get("LsTrmService")
-            if not service:
-                return None
+        service = data.get("LsTrmService")
+        if not service:
+            return None
 
-            defs = service.get("법령용어정의")
-            codes = service.get("법령용어코드명")
+        defs = service.get("법령용어정의")
+        codes = service.get("법령용어코드명")
 
-            if not codes:
-                return None
+        if not codes:
+            return None
 
-            # 단일/복수 케이스 통일
-            if isinstance(codes, str):
-                codes = [codes]
-                defs = [defs] if isinstance(defs, str) else [defs or ""]
+        # 단일/복수 케이스 통일
+        if isinstance(codes, str):
+            codes = [codes]
+            defs = [defs] if isinstance(defs, str) else [defs or ""]
 
-            korean_def = None
-            english_def = None
+        korean_def = None
+        english_def = None
 
-            for code, definition in zip(codes, defs):
-                if code == "법령한영사전":
-                    english_def = (definition or "").strip()
-                elif not korean_def:
-                    korean_def = (definition or "").strip()
+        for code, definition in zip(codes, defs):
+            if code == "법령한영사전":
+                english_def = (definition or "").strip()
+            elif not korean_def:
+                korean_def = (definition or "").strip()
 
-            if not korean_def:
-                return None
+        if not korean_def:
+            return None
 
-            return TermDefinition(term=term, korean=korean_def, english=english_def)
+        return TermDefinition(term=term, korean=korean_def, english=english_def)
 
     except Exception:
         return None
 
 
+def _term_key(term: str) -> str:
+    return make_cache_key("term", term)
+
+
+def _load_persisted_terms(terms: List[str]) -> Dict[str, dict]:
+    """SQLite 캐시에서 용어별 정의를 한 번에 읽는다 (to_thread 에서 호출)."""
+    found = {}
+    for t in terms:
+        data = llm_cache.get(_term_key(t))
+        if data is not None:
+            found[t] = data
+    return found
+
+
+def _persist_terms(defs: Dict[str, dict]) -> None:
+    for t, data in defs.items():
+        llm_cache.set(_term_key(t), data, ttl=TERM_CACHE_TTL)
+
+
 async def fetch_term_definitions(terms: List[str]) -> Dict[str, TermDefinition]:
     """
     여러 용어를 병렬로 조회해서 term -> TermDefinition 매핑으로 리턴.
+
+    용어 단위로 캐시한다 (메모리 → SQLite → 법제처 API 순).
+    계약서마다 겹치는 용어(손해배상, 해지, 위약금 …)는 API 를 다시 부르지 않는다.
     """
     if not settings.MOLEG_API_KEY:
         return {}
 
-    async with aiohttp.ClientSession() as session:
-        tasks = [_fetch_single_term(session, t) for t in terms]
-        results = await asyncio.gather(*tasks)
-
-    term_map: Dict[str, TermDefinition] = {}
-    for t, r in zip(terms, results):
-        if r:
-            term_map[t] = r
-    return term_map
+    found: Dict[str, dict] = {}
+    to_load: List[str] = []
+
+    for t in dict.fromkeys(terms):
+        cached = term_cache.get(t)
+        if cached is None:
+            to_load.append(t)
+        else:
+            found[t] = cached
+
+    # 메모리에 없는 것만 SQLite 캐시 확인
+    if to_load:
+        persisted = await asyncio.to_thread(_load_persisted_terms, to_load)
+        for t, data in persisted.items():
+            term_cache.set(t, data)
+        found.update(persisted)
+
+    # 어디에도 없는 용어만 법제처 API 호출
+    to_fetch = [t for t in to_load if t not in found]
+    if to_fetch:
+        # lstrm 조회는 query 에 용어 하나만 받으므로 용어별 요청을 공용 세션 위에서 동시에 보냄
+        session = _get_session()
+        results = await asyncio.gather(
+            *[_fetch_single_term(session, t) for t in to_fetch],
+            return_exceptions=True,
+        )
+
+        fetched = {}
+        for t, r in zip(to_fetch, results):
+            if isinstance(r, Exception):
+                # 일시 장애(브레이커 열림 / 재시도 소진)는 캐시하지 않음 → 다음 요청에서 다시 조회
+                continue
+            if r:
+                fetched[t] = found[t] = r.model_dump()
+                term_cache.set(t, fetched[t])
+            else:
+                # 정의 없음도 잠깐 기억해서 같은 용어로 API 를 반복 호출하지 않음
+                term_cache.set(t, {}, ttl=TERM_MISS_TTL)
+
+        if fetched:
+            await asyncio.to_thread(_persist_terms, fetched)
+
+    return {t: TermDefinition.model_validate(d) for t, d in found.items() if d}
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from typing import Dict, Any
+import logging
+import re
+from string import Template
+from types import MappingProxyType
+from typing import Any, Dict, Optional
 from app.core.logger import logger
 
 import google.generativeai as genai
+import orjson
+from google.api_core import exceptions as google_exceptions
 
 from app.core.config import settings
 from app.core.cache import contract_cache
+from app.core.resilience import CircuitBreaker, CircuitOpenError, retry_async
+from app.services.llm_batcher import PromptBatcher
+from app.services.llm_cache import CACHE_DB_PATH, llm_cache, make_cache_key
+from app.services.semantic_cache import SemanticCache
+from app.utils.text_cleaner import normalize_for_hash
 from app.models.legal import (
     DocumentResult,
     DocumentMeta,
@@ -19,8 +29,12 @@ from app.models.legal import (
     ClauseCausality,
     TermDefinition,
 )
-from app.nlp.extractor import NLPInfo
-from app.services.llm_prompt import build_contract_analysis_prompt
+from app.nlp.extractor import Clause, NLPInfo
+from app.services.llm_prompt import (
+    PROMPT_VERSION,
+    build_clause_analysis_prompt,
+    build_contract_analysis_prompt,
+)
 
 
 # ----------------------------------------------------------
@@ -29,30 +43,69 @@ from app.services.llm_prompt import build_contract_analysis_prompt
 genai.configure(api_key=settings.GEMINI_API_KEY)
 _MODEL_NAME = "gemini-2.5-flash"
 
+# 계약서 분석 생성 설정 (스트리밍 / Batch API 공용)
+CONTRACT_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "response_mime_type": "application/json",
+    "max_output_tokens": 24000,
+}
+
+# 조항 1개 분석 생성 설정 (LLM_CLAUSE_SPLIT_ENABLED)
+CLAUSE_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "response_mime_type": "application/json",
+    "max_output_tokens": 4000,
+}
+
+
+# 거의 같은 계약서(OCR 잡음 등) 재분석 방지 (SEMANTIC_CACHE_ENABLED 일 때만 사용)
+semantic_cache = SemanticCache(CACHE_DB_PATH, threshold=settings.SEMANTIC_CACHE_THRESHOLD)
+
+
+# 모델 객체는 모듈 로드 시 한 번만 생성해 계약서 분석 / Q&A 가 같이 사용
+_MODEL = genai.GenerativeModel(_MODEL_NAME)
+
 
 def _get_model():
-    return genai.GenerativeModel(_MODEL_NAME)
+    return _MODEL
+
+
+# 재시도할 Gemini 일시 오류 (429 / 503 / 타임아웃)
+GEMINI_RETRYABLE = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    asyncio.TimeoutError,
+)
+
+# 연속 실패가 쌓이면 잠시 Gemini 호출을 멈추고 바로 fallback 응답
+gemini_breaker = CircuitBreaker("Gemini", fail_max=10, reset_timeout=30)
 
 
 # ----------------------------------------------------------
 # Streaming 응답 처리
 # ----------------------------------------------------------
-async def _stream_llm_text(prompt: str) -> str:
+async def _stream_llm_text(prompt: str, generation_config: dict = CONTRACT_GENERATION_CONFIG) -> str:
+    return await retry_async(
+        lambda: _stream_llm_text_once(prompt, generation_config),
+        retry_on=GEMINI_RETRYABLE,
+        breaker=gemini_breaker,
+    )
+
+
+async def _stream_llm_text_once(prompt: str, generation_config: dict) -> str:
     model = _get_model()
 
-    response = model.generate_content(
+    # async 스트림 사용 → 청크를 기다리는 동안 이벤트 루프를 막지 않음
+    response = await model.generate_content_async(
         prompt,
         stream=True,
-        generation_config={
-            "temperature": 0.2,
-            "response_mime_type": "application/json",
-            "max_output_tokens": 24000,
-        },
+        generation_config=generation_config,
     )
 
     chunks: list[str] = []
 
-    for chunk in response:
+    async for chunk in response:
         try:
             if not hasattr(chunk, "candidates") or not chunk.candidates:
                 continue
@@ -68,86 +121,122 @@ async def _stream_llm_text(prompt: str) -> str:
     return "".join(chunks)
 
 
+# 동시 분석 요청 합치기 (LLM_BATCH_ENABLED 일 때만 사용)
+_contract_batcher = PromptBatcher(
+    _stream_llm_text,
+    max_batch=settings.LLM_BATCH_MAX_SIZE,
+    max_wait_ms=settings.LLM_BATCH_MAX_WAIT_MS,
+)
+
+
+async def _run_contract_prompt(prompt: str) -> str:
+    if settings.LLM_BATCH_ENABLED:
+        return await _contract_batcher.submit(prompt)
+    return await _stream_llm_text(prompt)
+
+
 # ----------------------------------------------------------
 # 코드블록 제거 및 JSON 위치 보정
 # ----------------------------------------------------------
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
 def _strip_to_json(text: str) -> str:
     if not text:
         return ""
-    t = text.strip()
-
-    if t.startswith("```"):
-        t = t.lstrip("`").lstrip()
-        if t.lower().startswith("json"):
-            t = t[4:].lstrip()
-    if t.endswith("```"):
-        t = t[:-3]
+    t = _CODE_FENCE.sub("", text.strip())
 
+    # '{' 앞은 잘라내고, 뒤쪽 공백만 정리 (앞은 이미 '{' 로 시작)
     first = t.find("{")
-    if first != -1:
-        t = t[first:]
-
-    return t.strip()
+    return t[first:].rstrip() if first != -1 else t.strip()
 
 
 # ----------------------------------------------------------
 # JSON 자동 복원기
 # ----------------------------------------------------------
 def _repair_json(json_text: str) -> str:
+    """
+    한 번의 선형 스캔으로 흔한 LLM JSON 손상을 보정한다.
+    - 닫는 괄호 앞 trailing comma 제거
+    - 최상위 객체가 닫힌 뒤에 붙은 잡음 제거
+    - 응답이 잘린 경우 열린 문자열/괄호를 순서대로 닫음
+    """
     if not json_text:
         return json_text
 
     s = json_text.strip()
 
+    # 대부분의 응답은 정상 → 스캔 없이 통과
     try:
-        json.loads(s)
+        orjson.loads(s)
         return s
-    except:
+    except ValueError:
         pass
 
-    last = s.rfind("}")
-    if last != -1:
-        candidate = s[: last + 1]
-        try:
-            json.loads(candidate)
-            return candidate
-        except:
-            s = candidate
-
-    for _ in range(3):
-        replaced = (
-            s.replace(", }", "}")
-             .replace(", ]", "]")
-             .replace(",\n}", "}")
-        )
-
-        if replaced == s:
-            break
+    out: list[str] = []
+    closers: list[str] = []
+    in_string = False
+    escape = False
+
+    def _drop_trailing_comma() -> None:
+        j = len(out) - 1
+        while j >= 0 and out[j] in " \t\r\n":
+            j -= 1
+        if j >= 0 and out[j] == ",":
+            del out[j]
+
+    for ch in s:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
 
-        s = replaced
-        try:
-            json.loads(s)
-            return s
-        except:
+        if ch == '"':
+            in_string = True
+        elif ch == "{":
+            closers.append("}")
+        elif ch == "[":
+            closers.append("]")
+        elif ch in "}]":
+            if not closers:
+                continue
+            _drop_trailing_comma()
+            out.append(closers.pop())
+            if not closers:
+                break
             continue
 
-    opens = s.count("{")
-    closes = s.count("}")
-    if opens > closes:
-        s += "}" * (opens - closes)
-        try:
-            json.loads(s)
-            return s
-        except:
-            pass
+        out.append(ch)
 
-    return json_text
+    # 잘린 응답 마무리
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    if closers and "".join(out).rstrip().endswith(":"):
+        out.append("null")   # 키만 있고 값이 잘린 경우
+    while closers:
+        _drop_trailing_comma()
+        out.append(closers.pop())
+
+    return "".join(out)
 
 
 # ----------------------------------------------------------
 # 리스크레벨 자동 변환
 # ----------------------------------------------------------
-RISK_LEVEL_MAP = {
+# 읽기 전용 (키는 모두 소문자/공백 제거 상태)
+RISK_LEVEL_MAP = MappingProxyType({
+    # 한국어 (그대로 유지)
+    "낮음": "낮음",
+    "중간": "중간",
+    "높음": "높음",
+    "치명적": "치명적",
     # 영어
     "low": "낮음",
     "medium": "중간",
@@ -160,14 +249,54 @@ RISK_LEVEL_MAP = {
     "trung bình": "중간",
     "cao": "높음",
     "nghiêm trọng": "치명적",
-}
+})
 
 def fix_risk_level(val: str) -> str:
     """LLM 출력 risk_level → 강제 한국어 매핑"""
     if not isinstance(val, str):
         return "중간"
-    s = val.strip().lower()
-    return RISK_LEVEL_MAP.get(s, "중간")  # 매핑 실패 시 기본값 적용
+    # 대부분은 이미 '낮음/중간/높음/치명적' → strip/lower 없이 바로 매핑
+    mapped = RISK_LEVEL_MAP.get(val)
+    if mapped is not None:
+        return mapped
+    return RISK_LEVEL_MAP.get(val.strip().lower(), "중간")  # 매핑 실패 시 기본값 적용
+
+
+def _to_int(x):
+    try:
+        return int(float(x))
+    except:
+        return 0
+
+
+# ----------------------------------------------------------
+# ClauseResult 객체 파싱 (문서 응답 / 조항별 응답 공용)
+# ----------------------------------------------------------
+def _parse_clause_result(c: dict) -> ClauseResult:
+    tags_raw = c.get("tags", {}) or {}
+
+    # ⚡ clauses risk_level 강제 한국어 변환 적용 (핵심 수정)
+    raw_clause_level = c.get("risk_level", "중간")
+    fixed_clause_risk = fix_risk_level(raw_clause_level)
+
+    return ClauseResult(
+        clause_id=c.get("clause_id", "unknown"),
+        title=c.get("title"),
+        raw_text=c.get("raw_text", ""),
+        summary=c.get("summary", ""),
+        risk_level=fixed_clause_risk,         # ← ★ 중요!
+        risk_score=_to_int(c.get("risk_score", 50)),
+        risk_factors=c.get("risk_factors", []) or [],
+        protections=c.get("protections", []) or [],
+        red_flags=c.get("red_flags", []) or [],
+        action_guides=c.get("action_guides", []) or [],
+        key_points=c.get("key_points", []) or [],
+        tags=ClauseTags(
+            domain=tags_raw.get("domain", []) or [],
+            risk=tags_raw.get("risk", []) or [],
+            parties=tags_raw.get("parties", []) or [],
+        ),
+    )
 
 
 # ----------------------------------------------------------
@@ -196,14 +325,7 @@ def _safe_parse_document_result(data: dict) -> DocumentResult:
 
     risk_raw = data.get("risk_profile", {}) or {}
 
-    def _to_int(x):
-        try:
-            return int(float(x))
-        except:
-            return 0
-
-    raw_level = (risk_raw.get("overall_risk_level", "중간") or "").lower()
-    mapped_level = fix_risk_level(raw_level)
+    mapped_level = fix_risk_level(risk_raw.get("overall_risk_level", "중간"))
 
     dims_raw = risk_raw.get("risk_dimensions", {}) or {}
     fixed_dims = {k: _to_int(v) for k, v in dims_raw.items()}
@@ -218,33 +340,7 @@ def _safe_parse_document_result(data: dict) -> DocumentResult:
     # ---------------------------------------------------------
     # ⚡ clauses risk_level 강제 한국어 변환 적용 (핵심 수정)
     # ---------------------------------------------------------
-    clauses_out = []
-    for c in data.get("clauses", []) or []:
-        tags_raw = c.get("tags", {}) or {}
-
-        raw_clause_level = c.get("risk_level", "중간")
-        fixed_clause_risk = fix_risk_level(raw_clause_level)
-
-        clauses_out.append(
-            ClauseResult(
-                clause_id=c.get("clause_id", "unknown"),
-                title=c.get("title"),
-                raw_text=c.get("raw_text", ""),
-                summary=c.get("summary", ""),
-                risk_level=fixed_clause_risk,         # ← ★ 중요!
-                risk_score=_to_int(c.get("risk_score", 50)),
-                risk_factors=c.get("risk_factors", []) or [],
-                protections=c.get("protections", []) or [],
-                red_flags=c.get("red_flags", []) or [],
-                action_guides=c.get("action_guides", []) or [],
-                key_points=c.get("key_points", []) or [],
-                tags=ClauseTags(
-                    domain=tags_raw.get("domain", []) or [],
-                    risk=tags_raw.get("risk", []) or [],
-                    parties=tags_raw.get("parties", []) or [],
-                ),
-            )
-        )
+    clauses_out = [_parse_clause_result(c) for c in data.get("clauses", []) or []]
 
     causal_out = []
     for rel in data.get("causal_graph", []) or []:
@@ -279,6 +375,161 @@ def _safe_parse_document_result(data: dict) -> DocumentResult:
     )
 
 
+# ----------------------------------------------------------
+# JSON 파싱 시도 / 실패 시 대체 결과
+# ----------------------------------------------------------
+def _try_parse(raw_text: str) -> Optional[dict]:
+    """코드블록 제거 + 잘린 JSON 복원 후 파싱. 실패하면 None."""
+    json_text = _repair_json(_strip_to_json(raw_text))
+    try:
+        data = orjson.loads(json_text)
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _fallback(nlp_info: NLPInfo) -> dict:
+    """파싱 실패 시에만 만드는 기본 응답 (성공 경로에서는 dict 를 만들지 않음)"""
+    return {
+        "document_id": "fallback",
+        "meta": {
+            "language": nlp_info.language,
+            "domain_tags": nlp_info.domain_tags,
+            "parties": nlp_info.parties,
+        },
+        "summary": {
+            "title": "AI 분석 오류",
+            "overall_summary": "LLM 응답 파싱 실패.",
+            "one_line_summary": "파싱 오류",
+            "key_points": [],
+            "main_risks": [],
+            "main_protections": [],
+            "recommended_actions": [],
+        },
+        "risk_profile": {
+            "overall_risk_level": "중간",
+            "overall_risk_score": 50,
+            "risk_dimensions": {},
+            "comments": "LLM 응답 파싱 오류.",
+        },
+        "clauses": [],
+        "causal_graph": [],
+        "terms": [],
+    }
+
+
+# ----------------------------------------------------------
+# LLM 원문 → DocumentResult (스트리밍 / Batch 결과 공용)
+# ----------------------------------------------------------
+def parse_contract_analysis(raw_text: str, nlp_info: NLPInfo) -> DocumentResult:
+    # 빠른 경로: 응답이 스키마를 그대로 만족하면 pydantic-core 로 바로 검증 (중간 dict/수동 변환 생략)
+    try:
+        result = DocumentResult.model_validate_json(raw_text)
+    except ValueError:
+        pass
+    else:
+        # 느린 경로(_safe_parse_document_result)와 같은 기본값 → 어느 경로로 파싱돼도 결과 동일
+        if "document_id" not in result.model_fields_set:
+            result.document_id = "auto_generated"
+        return result
+
+    # 느린 경로: 코드블록 제거 + JSON 복원 + 필드별 보정
+    data = _try_parse(raw_text)
+    if data is None:
+        logger.warning("❌ JSON 파싱 실패 → fallback 사용")
+        data = _fallback(nlp_info)
+
+    return _safe_parse_document_result(data)
+
+
+# ----------------------------------------------------------
+# 조항별 동시 분석 (LLM_CLAUSE_SPLIT_ENABLED)
+# ----------------------------------------------------------
+def _clause_fallback(clause: Clause) -> ClauseResult:
+    return ClauseResult(
+        clause_id=clause.clause_id,
+        title=clause.title,
+        raw_text=clause.raw_text,
+        summary="조항 분석 실패",
+        risk_level="중간",
+        risk_score=50,
+    )
+
+
+async def _analyze_clause(clause: Clause, nlp_info: NLPInfo, output_language: str) -> ClauseResult:
+    prompt = build_clause_analysis_prompt(clause, nlp_info, output_language)
+    raw_text = await _stream_llm_text(prompt, CLAUSE_GENERATION_CONFIG)
+
+    data = _try_parse(raw_text)
+    if data is None:
+        logger.warning(f"❌ 조항 JSON 파싱 실패 → fallback 사용 ({clause.clause_id})")
+        return _clause_fallback(clause)
+    result = _parse_clause_result(data)
+
+    # ID/원문은 LLM 출력 대신 NLP 분할 결과로 고정
+    result.clause_id = clause.clause_id
+    result.raw_text = clause.raw_text
+    return result
+
+
+async def _analyze_clauses(nlp_info: NLPInfo, output_language: str) -> list[ClauseResult]:
+    sem = asyncio.Semaphore(settings.LLM_CONCURRENCY)
+    clauses = nlp_info.clauses[:10]
+
+    async def _bounded(c: Clause) -> ClauseResult:
+        async with sem:
+            return await _analyze_clause(c, nlp_info, output_language)
+
+    # 모든 태스크를 먼저 만든 뒤 한 번에 기다림 (동시 실행 수는 세마포어가 제한)
+    results = await asyncio.gather(*[_bounded(c) for c in clauses], return_exceptions=True)
+
+    out = []
+    for c, r in zip(clauses, results):
+        if isinstance(r, Exception):
+            logger.warning(f"⚠️ 조항 분석 실패 ({c.clause_id}) → fallback: {r}")
+            r = _clause_fallback(c)
+        out.append(r)
+    return out
+
+
+# ----------------------------------------------------------
+# 3차: 의미 기반 캐시 (정확 일치 실패 시 유사 계약서 결과 재사용)
+# ----------------------------------------------------------
+async def _get_or_run_semantic(
+    cache_key: str,
+    original_text: str,
+    output_language: str,
+    split_clauses: bool,
+    run_llm,
+) -> dict:
+    data = await asyncio.to_thread(llm_cache.get, cache_key)
+    if data is not None:
+        return data
+
+    # 프롬프트/모델/조항 분할 여부가 바뀌면 다른 네임스페이스 → 이전 결과와 섞이지 않음
+    namespace = make_cache_key(
+        output_language,
+        PROMPT_VERSION,
+        _MODEL_NAME,
+        *(["split"] if split_clauses else []),
+    )
+    similar_key, vector = await semantic_cache.get(original_text, namespace)
+    if similar_key:
+        data = await asyncio.to_thread(llm_cache.get, similar_key)
+        if data is not None:
+            logger.info("🧠 의미 캐시 hit → LLM 호출 생략")
+            return data
+        # llm_cache 쪽 결과가 만료됨 → 벡터도 정리
+        await semantic_cache.remove(namespace, similar_key)
+
+    data = await run_llm()
+    if data.get("document_id") != "fallback":
+        await asyncio.to_thread(llm_cache.set, cache_key, data)
+        if vector is not None:
+            await semantic_cache.put(namespace, cache_key, vector)
+    return data
+
+
 # ----------------------------------------------------------
 # 메인 계약서 분석 함수
 # ----------------------------------------------------------
@@ -289,79 +540,73 @@ async def analyze_contract(
     output_language: str = "ko",
 ) -> DocumentResult:
 
-    cache_key = contract_cache.make_key(original_text + nlp_info.language)
-    cached = contract_cache.get(cache_key)
-    if cached:
-        return cached
+    # 캐시 키: 정규화 텍스트 + 출력 언어 + 프롬프트 버전
+    split_clauses = settings.LLM_CLAUSE_SPLIT_ENABLED and bool(nlp_info.clauses)
 
-    prompt = build_contract_analysis_prompt(
-        original_text,
-        nlp_info,
-        term_definitions,
+    cache_key = make_cache_key(
+        normalize_for_hash(original_text),
         output_language,
+        PROMPT_VERSION,
+        *(["split"] if split_clauses else []),   # 프롬프트 구성이 달라 결과를 따로 보관
     )
 
-    raw_text = await _stream_llm_text(prompt)
-
-    print("\n=============== RAW TEXT BEFORE PARSE ===============")
-    print(raw_text)
-    print("=====================================================\n")
-
-    json_text = _strip_to_json(raw_text)
-    json_text = _repair_json(json_text)
-
-    data = None
-    try:
-        data = json.loads(json_text)
-    except:
-        pass
-
-    if data is None:
-        last = json_text.rfind("}")
-        if last != -1:
-            try:
-                data = json.loads(json_text[: last + 1])
-            except:
-                pass
+    async def _run_llm() -> dict:
+        prompt = build_contract_analysis_prompt(
+            original_text,
+            nlp_info,
+            term_definitions,
+            output_language,
+            include_clauses=not split_clauses,
+        )
 
+        try:
+            if split_clauses:
+                # 문서 요약/리스크 프롬프트와 조항별 프롬프트를 동시에 실행
+                raw_text, clauses_out = await asyncio.gather(
+                    _run_contract_prompt(prompt),
+                    _analyze_clauses(nlp_info, output_language),
+                )
+            else:
+                raw_text = await _run_contract_prompt(prompt)
+        except CircuitOpenError:
+            # Gemini 장애 중 → 재시도 대기 없이 fallback (document_id="fallback" 이라 캐시되지 않음)
+            logger.warning("⚠️ Gemini 서킷 브레이커 열림 → fallback 사용")
+            return _safe_parse_document_result(_fallback(nlp_info)).model_dump()
+
+        # 응답 원문(최대 수만 토큰)은 DEBUG 일 때만 기록
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("RAW TEXT BEFORE PARSE:\n%s", raw_text)
+
+        result = parse_contract_analysis(raw_text, nlp_info)
+        if split_clauses:
+            result.clauses = clauses_out
+        return result.model_dump()
+
+    # 1차: 프로세스 메모리 / 2차: SQLite 영구 캐시
+    # (호출부에서 document_id 를 덮어쓰므로 dict 로 보관하고 매번 새 객체로 복원)
+    data = contract_cache.get(cache_key)
     if data is None:
-        print("❌ JSON 파싱 실패 → fallback 사용")
-        data = {
-            "document_id": "fallback",
-            "meta": {
-                "language": nlp_info.language,
-                "domain_tags": nlp_info.domain_tags,
-                "parties": nlp_info.parties,
-            },
-            "summary": {
-                "title": "AI 분석 오류",
-                "overall_summary": "LLM 응답 파싱 실패.",
-                "one_line_summary": "파싱 오류",
-                "key_points": [],
-                "main_risks": [],
-                "main_protections": [],
-                "recommended_actions": [],
-            },
-            "risk_profile": {
-                "overall_risk_level": "중간",
-                "overall_risk_score": 50,
-                "risk_dimensions": {},
-                "comments": "LLM 응답 파싱 오류.",
-            },
-            "clauses": [],
-            "causal_graph": [],
-            "terms": [],
-        }
+        if not settings.SEMANTIC_CACHE_ENABLED:
+            data = await llm_cache.get_or_set(
+                cache_key,
+                _run_llm,
+                cache_if=lambda d: d.get("document_id") != "fallback",   # 파싱 실패 결과는 저장 안 함
+            )
+        else:
+            data = await _get_or_run_semantic(
+                cache_key, original_text, output_language, split_clauses, _run_llm
+            )
+        # fallback(파싱 실패 / 브레이커 열림)은 메모리 캐시에도 남기지 않음 → 복구 후 바로 재분석
+        if data.get("document_id") != "fallback":
+            contract_cache.set(cache_key, data)
 
-    result = _safe_parse_document_result(data)
-    contract_cache.set(cache_key, result)
-    return result
+    return DocumentResult.model_validate(data)
 
 
 # ----------------------------------------------------------
 # 다국어 법률 Q&A
 # ----------------------------------------------------------
-LANGUAGE_PROMPTS = {
+LANGUAGE_PROMPTS = MappingProxyType({
     "ko": {
         "system": "당신은 한국 법률 전문가입니다.",
         "sections": {
@@ -404,18 +649,16 @@ LANGUAGE_PROMPTS = {
             "analysis": "Phân tích chi tiết",
         }
     }
-}
+})
 
 
-async def generate_legal_answer_multilang(question: str, language: str = "ko") -> str:
-
-    lang_config = LANGUAGE_PROMPTS.get(language, LANGUAGE_PROMPTS["ko"])
+def _build_qa_template(lang_config: dict) -> Template:
     sections = lang_config["sections"]
 
-    prompt = f"""
-{lang_config["system"]} Answer the question below in {language.upper()}.
+    return Template(f"""
+{lang_config["system"]} Answer the question below in $language.
 
-Question: {question}
+Question: $question
 
 ## {sections["summary"]}
 [One sentence summary]
@@ -445,12 +688,24 @@ Question: {question}
 
 ## {sections["laws"]}
 - [Law name]
-"""
+""")
+
+
+# 언어별 Q&A 프롬프트 틀은 모듈 로드 시 한 번만 조립 (요청마다 질문/언어만 채움)
+QA_PROMPT_TEMPLATES = MappingProxyType(
+    {lang: _build_qa_template(cfg) for lang, cfg in LANGUAGE_PROMPTS.items()}
+)
+
+
+async def generate_legal_answer_multilang(question: str, language: str = "ko") -> str:
+
+    template = QA_PROMPT_TEMPLATES.get(language, QA_PROMPT_TEMPLATES["ko"])
+    prompt = template.substitute(language=language.upper(), question=question)
 
     try:
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        response = await asyncio.to_thread(
-            model.generate_content,
+        model = _get_model()
+        # 네이티브 async 호출 → 스레드풀 워커를 점유하지 않음
+        response = await model.generate_content_async(
             prompt,
             generation_config=genai.GenerationConfig(
                 temperature=0.3,
@@ -0,0 +1,125 @@
+# backend/app/services/llm_batch.py
+"""
+Gemini Batch API 연동 (대량 계약서 분석용)
+
+- 요청마다 스트리밍 호출하는 대신 JSONL 하나로 묶어 Batch 작업으로 제출한다.
+- Batch 작업은 비동기로 처리되며(최대 24시간) 비용이 일반 호출의 절반이다.
+- google-generativeai 에는 Batch API 가 없어 google-genai 클라이언트를 사용한다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from google import genai
+from google.genai import types
+
+from app.core.config import settings
+from app.services.llm import CONTRACT_GENERATION_CONFIG, _MODEL_NAME
+
+
+# Batch 작업 종료 상태
+BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+_client: Optional[genai.Client] = None
+
+
+def _get_client() -> genai.Client:
+    global _client
+    if _client is None:
+        _client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    return _client
+
+
+def _to_request_line(key: str, prompt: str) -> dict:
+    return {
+        "key": key,
+        "request": {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": CONTRACT_GENERATION_CONFIG["temperature"],
+                "responseMimeType": CONTRACT_GENERATION_CONFIG["response_mime_type"],
+                "maxOutputTokens": CONTRACT_GENERATION_CONFIG["max_output_tokens"],
+            },
+        },
+    }
+
+
+# ----------------------------------------------------------
+# 1) Batch 제출
+# ----------------------------------------------------------
+def submit_contract_batch(prompts: List[Tuple[str, str]]) -> str:
+    """
+    (key, prompt) 목록을 JSONL 로 업로드하고 Batch 작업을 생성한다.
+    반환값은 Batch 작업 이름 (예: 'batches/abc123').
+    """
+    client = _get_client()
+
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".jsonl", encoding="utf-8", delete=False
+    ) as f:
+        for key, prompt in prompts:
+            f.write(json.dumps(_to_request_line(key, prompt), ensure_ascii=False) + "\n")
+        path = f.name
+
+    try:
+        uploaded = client.files.upload(
+            file=path,
+            config=types.UploadFileConfig(display_name="contract-batch", mime_type="jsonl"),
+        )
+    finally:
+        os.remove(path)
+
+    job = client.batches.create(
+        model=_MODEL_NAME,
+        src=uploaded.name,
+        config={"display_name": "contract-batch"},
+    )
+    return job.name
+
+
+# ----------------------------------------------------------
+# 2) Batch 상태 조회 + 결과 수집
+# ----------------------------------------------------------
+def _response_text(response: dict) -> str:
+    candidates = response.get("candidates") or []
+    if not candidates:
+        return ""
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(p.get("text", "") for p in parts)
+
+
+def fetch_batch_results(job_name: str) -> Tuple[str, Optional[Dict[str, str]]]:
+    """
+    Batch 작업 상태를 조회한다.
+    성공 상태면 key -> LLM 원문 텍스트 매핑을 함께 반환하고, 아니면 None.
+    """
+    client = _get_client()
+    job = client.batches.get(name=job_name)
+    state = job.state.name
+
+    if state != "JOB_STATE_SUCCEEDED":
+        return state, None
+
+    raw = client.files.download(file=job.dest.file_name)
+    results: Dict[str, str] = {}
+
+    for line in raw.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        if "response" in item:
+            results[item["key"]] = _response_text(item["response"])
+        else:
+            # 개별 요청 실패 → 빈 응답으로 두고 파싱 단계에서 fallback 처리
+            results[item["key"]] = ""
+
+    return state, results
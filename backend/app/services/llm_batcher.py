@@ -0,0 +1,156 @@
+# backend/app/services/llm_batcher.py
+"""
+동시에 들어온 LLM 요청을 짧은 시간창(기본 50ms) 동안 모아 한 번의 Gemini 호출로 합치는 배처
+
+- 요청마다 붙는 고정 지시문/스키마 토큰과 호출 오버헤드를 여러 문서가 나눠 쓴다.
+- 합친 응답을 요청별로 나누지 못하면(누락/파싱 실패) 해당 요청만 단건 호출로 다시 처리한다.
+- 출력 토큰 한도 때문에 배치 크기와 합친 프롬프트 길이를 작게 제한한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from app.core.logger import logger
+
+
+_Item = Tuple[str, "asyncio.Future[str]"]
+
+
+def _build_combined_prompt(prompts: List[str]) -> str:
+    keys = ", ".join(f'"req_{i}": <요청 req_{i} 의 JSON 결과>' for i in range(len(prompts)))
+    blocks = "\n\n".join(
+        f"===== 요청 req_{i} 시작 =====\n{p.strip()}\n===== 요청 req_{i} 끝 ====="
+        for i, p in enumerate(prompts)
+    )
+    return f"""
+아래 {len(prompts)}개의 서로 독립된 요청을 각각 처리하십시오.
+각 요청의 지시와 출력 스키마를 그대로 따르되, 최종 출력은 아래 형태의 JSON 객체 하나로만 작성하십시오.
+{{{keys}}}
+
+{blocks}
+"""
+
+
+class PromptBatcher:
+    def __init__(
+        self,
+        run_single: Callable[[str], Awaitable[str]],
+        max_batch: int = 3,
+        max_wait_ms: int = 50,
+        max_prompt_chars: int = 60_000,
+    ):
+        self._run_single = run_single
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self._max_prompt_chars = max_prompt_chars
+
+        self._queue: Optional[asyncio.Queue[_Item]] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 실행 중인 배치 태스크 참조 보관 (GC 로 중간에 사라지지 않도록)
+        self._tasks: Set[asyncio.Task] = set()
+
+    # ----------------------------------------------------------
+    # 외부 API
+    # ----------------------------------------------------------
+    async def submit(self, prompt: str) -> str:
+        """프롬프트를 큐에 넣고 (배치로 처리된) LLM 원문 텍스트를 기다린다."""
+        loop = asyncio.get_running_loop()
+
+        # 너무 큰 프롬프트는 합칠 여지가 없으므로 바로 단건 호출
+        if len(prompt) * 2 > self._max_prompt_chars:
+            return await self._run_single(prompt)
+
+        self._ensure_worker(loop)
+        fut: asyncio.Future[str] = loop.create_future()
+        await self._queue.put((prompt, fut))
+        return await fut
+
+    # ----------------------------------------------------------
+    # 내부: 큐 수집 루프
+    # ----------------------------------------------------------
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect())
+
+    async def _collect(self) -> None:
+        carry: Optional[_Item] = None
+
+        while True:
+            first = carry or await self._queue.get()
+            carry = None
+
+            batch = [first]
+            size = len(first[0])
+            deadline = self._loop.time() + self._max_wait
+
+            while len(batch) < self._max_batch:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+                # 합친 길이가 한도를 넘으면 다음 배치의 첫 요청으로 넘김
+                if size + len(item[0]) > self._max_prompt_chars:
+                    carry = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            task = self._loop.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._on_dispatch_done)
+
+    def _on_dispatch_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ LLM 배치 처리 태스크 실패: {task.exception()!r}")
+
+    # ----------------------------------------------------------
+    # 내부: 배치 실행 + 요청별 결과 분배
+    # ----------------------------------------------------------
+    async def _dispatch(self, batch: List[_Item]) -> None:
+        if len(batch) == 1:
+            await self._resolve_single(batch[0])
+            return
+
+        results: dict = {}
+        try:
+            raw = await self._run_single(_build_combined_prompt([p for p, _ in batch]))
+            start, end = raw.find("{"), raw.rfind("}")
+            parsed = json.loads(raw[start:end + 1]) if start != -1 else {}
+            if isinstance(parsed, dict):
+                results = parsed
+        except Exception as e:
+            logger.warning(f"⚠️ LLM 배치 호출/파싱 실패 → 단건 재시도: {e}")
+
+        retry = []
+        for i, (prompt, fut) in enumerate(batch):
+            value = results.get(f"req_{i}")
+            if isinstance(value, dict) and not fut.done():
+                fut.set_result(json.dumps(value, ensure_ascii=False))
+            else:
+                retry.append((prompt, fut))
+
+        if retry:
+            logger.info(f"📌 LLM 배치 {len(batch)}건 중 {len(retry)}건 단건 재시도")
+            await asyncio.gather(*(self._resolve_single(item) for item in retry))
+
+    async def _resolve_single(self, item: _Item) -> None:
+        prompt, fut = item
+        try:
+            result = await self._run_single(prompt)
+        except Exception as e:
+            if not fut.done():
+                fut.set_exception(e)
+            return
+        if not fut.done():
+            fut.set_result(result)
@@ -0,0 +1,106 @@
+# backend/app/services/llm_cache.py
+"""
+LLM / 외부 API 응답 영구 캐시 (SQLite + zlib 압축)
+
+- 같은 문서(정규화 텍스트) + 언어 + 프롬프트 버전이면 Gemini 를 다시 부르지 않는다.
+- 메모리 캐시와 달리 서버 재시작, 워커 여러 개 사이에서도 공유된다.
+- 값은 JSON 직렬화 가능한 객체만 저장 (pydantic 모델은 model_dump() 해서 넣는다).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Optional
+
+from app.db.database import DB_PATH
+
+
+CACHE_DB_PATH = os.path.join(os.path.dirname(DB_PATH), "llm_cache.db")
+DEFAULT_TTL = 60 * 60 * 24 * 7   # 7일
+
+
+def make_cache_key(*parts: str) -> str:
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class SQLiteLLMCache:
+    def __init__(self, path: str, default_ttl: int = DEFAULT_TTL):
+        self._path = path
+        self._default_ttl = default_ttl
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        conn.commit()
+
+    # sqlite3 커넥션은 스레드 간 공유하지 않는다 (to_thread 워커마다 하나씩)
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+
+        value, expires_at = row
+        if expires_at < time.time():
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            conn.commit()
+            return None
+
+        return json.loads(zlib.decompress(value))
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        expires_at = time.time() + (ttl or self._default_ttl)
+
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, blob, expires_at),
+        )
+        conn.commit()
+
+    async def get_or_set(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        캐시에 있으면 바로 반환, 없으면 fetch() 결과를 저장 후 반환.
+        cache_if 가 False 를 돌려주는 값(파싱 실패 fallback 등)은 저장하지 않는다.
+        """
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            return cached
+
+        value = await fetch()
+        if cache_if is None or cache_if(value):
+            await asyncio.to_thread(self.set, key, value, ttl)
+        return value
+
+
+llm_cache = SQLiteLLMCache(CACHE_DB_PATH)
@@ -1,47 +1,46 @@
 # backend/app/services/llm_prompt.py
 
 import json
+from itertools import islice
 from typing import Dict
+
+import orjson
+
+from app.core.config import settings
 from app.models.legal import TermDefinition
-from app.nlp.extractor import NLPInfo
+from app.nlp.extractor import Clause, NLPInfo
+from app.utils.token_budget import estimate_tokens, truncate_to_tokens
 
-# -----------------------------------------
-# 언어별 값 생성 규칙 (summary, clauses, terms 등)
-# -----------------------------------------
-LANG_VALUE_RULE = {
-    "ko": "- 모든 value는 반드시 한국어로 작성하십시오.",
-    "en": "- All JSON values must be written in English, EXCEPT risk_level (Korean only).",
-    "vi": "- Tất cả giá trị JSON phải được viết bằng tiếng Việt, TRỪ risk_level (chỉ tiếng Hàn).",
-}
+# 프롬프트 내용을 바꾸면 반드시 올릴 것 → LLM 응답 캐시가 자동으로 무효화됨
+PROMPT_VERSION = "3"
+
+# 조항 원문 토큰 예산 (글자 수가 아닌 근사 토큰 수 기준 → 한글 계약서도 같은 예산)
+CLAUSE_TOKEN_BUDGET = 300           # 문서 프롬프트의 사전 분석 정보 (조항당)
+SPLIT_CLAUSE_TOKEN_BUDGET = 1200    # 조항별 프롬프트 (조항 1개)
 
 # -----------------------------------------
-# 언어별 설명 문구 (summary, clauses 생성용)
+# 언어별 규칙: (출력 언어 안내, value 작성 규칙)
 # -----------------------------------------
-LANG_PROMPT = {
-    "ko": "📌 출력 언어: 한국어로 작성하십시오.",
-    "en": "📌 Output Language: Write all JSON values in English **except risk_level** which must be Korean.",
-    "vi": "📌 Ngôn ngữ xuất: Viết tất cả giá trị JSON bằng tiếng Việt, **ngoại trừ risk_level** phải bằng tiếng Hàn.",
+LANG_RULES = {
+    "ko": (
+        "📌 출력 언어: 한국어로 작성하십시오.",
+        "- 모든 value는 반드시 한국어로 작성하십시오.",
+    ),
+    "en": (
+        "📌 Output Language: Write all JSON values in English **except risk_level** which must be Korean.",
+        "- All JSON values must be written in English, EXCEPT risk_level (Korean only).",
+    ),
+    "vi": (
+        "📌 Ngôn ngữ xuất: Viết tất cả giá trị JSON bằng tiếng Việt, **ngoại trừ risk_level** phải bằng tiếng Hàn.",
+        "- Tất cả giá trị JSON phải được viết bằng tiếng Việt, TRỪ risk_level (chỉ tiếng Hàn).",
+    ),
 }
 
 
-def build_contract_analysis_prompt(
-    original_text: str,
-    nlp_info: NLPInfo,
-    term_definitions: Dict[str, TermDefinition],
-    output_language: str = "ko",
-) -> str:
-    """
-    계약서 분석 LLM 프롬프트 생성기
-    """
-
-    # 언어 규칙 불러오기
-    lang_value_rule = LANG_VALUE_RULE.get(output_language, LANG_VALUE_RULE["ko"])
-    lang_instruction = LANG_PROMPT.get(output_language, LANG_PROMPT["ko"])
-
-    # -----------------------------------------
-    # risk_level은 어떤 언어에서도 반드시 한국어 고정
-    # -----------------------------------------
-    risk_level_rule = """
+# -----------------------------------------
+# risk_level은 어떤 언어에서도 반드시 한국어 고정
+# -----------------------------------------
+RISK_LEVEL_RULE = """
 ⚠️ risk_level 필드는 어떤 언어 모드에서도 반드시 다음 네 가지 중 하나만 사용하십시오:
 - '낮음'
 - '중간'
@@ -51,120 +50,98 @@ def build_contract_analysis_prompt(
 영어/베트남어 출력 모드에서도 risk_level 값은 절대로 'Low', 'Medium', 'High', 'Critical' 등 영어 단어를 사용하지 마십시오.
 """
 
-    # -----------------------------------------
-    # 조항/용어 사전 분석 정보
-    # -----------------------------------------
-    clauses_payload = [
+# -----------------------------------------
+# 조항 1개 출력 스키마 (문서 프롬프트 / 조항별 프롬프트 공용)
+# -----------------------------------------
+CLAUSE_SCHEMA = {
+    "clause_id": "조항 ID",
+    "title": "조항 제목",
+    "raw_text": "원문",
+    "summary": "1~2 문장 요약",
+    "risk_level": "낮음/중간/높음/치명적",
+    "risk_score": "0~100",
+    "risk_factors": ["1개 이상"],
+    "protections": ["1개 이상"],
+    "red_flags": ["1개 이상"],
+    "action_guides": ["1개 이상"],
+    "key_points": ["1개 이상"],
+    "tags": {
+        "domain": ["태그"],
+        "risk": ["태그"],
+        "parties": ["당사자"],
+    },
+}
+
+
+# -----------------------------------------
+# 출력 JSON 스키마 (문서 전체)
+# -----------------------------------------
+CONTRACT_SCHEMA = {
+    "document_id": "string, 예: 'auto_generated_1'",
+    "meta": {
+        "language": "ko/en/mixed 중 하나",
+        "domain_tags": ["문서의 주요 도메인 태그 리스트"],
+        "parties": ["근로자, 사용자, 매도인, 매수인 등"],
+        "governing_law": "예: '대한민국 법'",
+    },
+    "summary": {
+        "title": "문서 제목",
+        "overall_summary": "문서 전체 요약 (3~5문장)",
+        "one_line_summary": "핵심 한 문장 요약",
+        "key_points": ["핵심 포인트 2개 이상"],
+        "main_risks": ["위험 요소 2개 이상"],
+        "main_protections": ["보호 요소 2개 이상"],
+        "recommended_actions": ["실행 가이드 2개 이상"],
+    },
+    "risk_profile": {
+        "overall_risk_level": "낮음/중간/높음/치명적 중 하나",
+        "overall_risk_score": "0~100",
+        "risk_dimensions": {
+            "지급/대금": "0~100",
+            "해지/갱신": "0~100",
+            "위약금/손해배상": "0~100",
+            "책임/면책": "0~100",
+        },
+        "comments": "200자 이내 설명",
+    },
+    "clauses": [CLAUSE_SCHEMA],
+    "causal_graph": [
         {
-            "clause_id": c.clause_id,
-            "title": c.title,
-            "raw_text": c.raw_text[:500],
+            "from_clause_id": "조항 ID",
+            "to_clause_id": "조항 ID",
+            "relationship": "triggers/depends_on/conflicts_with/clarifies",
+            "description": "관계 설명",
         }
-        for c in nlp_info.clauses[:10]
-    ]
-
-    terms_payload = [
+    ],
+    "terms": [
         {
-            "term": t.term,
-            "korean": t.korean,
-            "english": t.english,
-            "source": t.source,
+            "term": "용어",
+            "korean": "설명",
+            "english": "영문 (있으면)",
+            "source": "출처",
         }
-        for t in term_definitions.values()
-    ][:30]
+    ],
+}
 
-    pre_analysis = {
-        "language": nlp_info.language,
-        "domain_tags_hint": nlp_info.domain_tags,
-        "parties_hint": nlp_info.parties,
-        "clauses": clauses_payload,
-        "terms": terms_payload,
-    }
 
-    # -----------------------------------------
-    # 출력 JSON 스키마
-    # -----------------------------------------
-    schema_description = {
-        "document_id": "string, 예: 'auto_generated_1'",
-        "meta": {
-            "language": "ko/en/mixed 중 하나",
-            "domain_tags": ["문서의 주요 도메인 태그 리스트"],
-            "parties": ["근로자, 사용자, 매도인, 매수인 등"],
-            "governing_law": "예: '대한민국 법'",
-        },
-        "summary": {
-            "title": "문서 제목",
-            "overall_summary": "문서 전체 요약 (3~5문장)",
-            "one_line_summary": "핵심 한 문장 요약",
-            "key_points": ["핵심 포인트 2개 이상"],
-            "main_risks": ["위험 요소 2개 이상"],
-            "main_protections": ["보호 요소 2개 이상"],
-            "recommended_actions": ["실행 가이드 2개 이상"],
-        },
-        "risk_profile": {
-            "overall_risk_level": "낮음/중간/높음/치명적 중 하나",
-            "overall_risk_score": "0~100",
-            "risk_dimensions": {
-                "지급/대금": "0~100",
-                "해지/갱신": "0~100",
-                "위약금/손해배상": "0~100",
-                "책임/면책": "0~100",
-            },
-            "comments": "200자 이내 설명",
-        },
-        "clauses": [
-            {
-                "clause_id": "조항 ID",
-                "title": "조항 제목",
-                "raw_text": "원문",
-                "summary": "1~2 문장 요약",
-                "risk_level": "낮음/중간/높음/치명적",
-                "risk_score": "0~100",
-                "risk_factors": ["1개 이상"],
-                "protections": ["1개 이상"],
-                "red_flags": ["1개 이상"],
-                "action_guides": ["1개 이상"],
-                "key_points": ["1개 이상"],
-                "tags": {
-                    "domain": ["태그"],
-                    "risk": ["태그"],
-                    "parties": ["당사자"],
-                },
-            }
-        ],
-        "causal_graph": [
-            {
-                "from_clause_id": "조항 ID",
-                "to_clause_id": "조항 ID",
-                "relationship": "triggers/depends_on/conflicts_with/clarifies",
-                "description": "관계 설명",
-            }
-        ],
-        "terms": [
-            {
-                "term": "용어",
-                "korean": "설명",
-                "english": "영문 (있으면)",
-                "source": "출처",
-            }
-        ],
-    }
+# -----------------------------------------
+# 프롬프트 고정 영역 (모듈 로드 시 한 번만 조립)
+# - 고정 영역(역할/규칙/스키마/출력 방식)을 앞에, 언어별 규칙과 문서별 사전 분석 정보를 뒤에 둔다
+#   → 요청이 달라도 앞부분이 바이트 단위로 같아 Gemini 프롬프트 접두사 캐시가 적중
+# -----------------------------------------
+def _contract_header(include_clauses: bool) -> str:
+    if include_clauses:
+        schema = CONTRACT_SCHEMA
+        clause_rule = "- clauses: 최소 5개, 최대 10개"
+    else:
+        schema = {k: v for k, v in CONTRACT_SCHEMA.items() if k != "clauses"}
+        clause_rule = "- clauses: 출력하지 마십시오 (조항별로 따로 분석함)"
 
-    # -----------------------------------------
-    # 최종 LLM Prompt
-    # -----------------------------------------
-    prompt = f"""
+    return f"""
 당신은 한국·영문 계약서를 분석하는 시니어 변호사입니다.
 입력된 원문이 매우 짧거나 간단해도 아래 스키마 전체를 **완전히 채운 풍부한 JSON**을 생성해야 합니다.
 
-===============================
-📌 언어 규칙
-===============================
-{lang_instruction}
-
-{lang_value_rule}
-
-{risk_level_rule}
+{RISK_LEVEL_RULE}
 
 ===============================
 🚫 절대 금지 규칙
@@ -179,28 +156,168 @@ def build_contract_analysis_prompt(
 ===============================
 📌 생성 규칙
 ===============================
-- clauses: 최소 5개, 최대 10개
+{clause_rule}
 - 모든 배열은 최소 2개 이상
 - terms: 최소 3개
 - causal_graph: 최소 1개
 - summary 섹션의 모든 필드 최소 2개 이상
 
-===============================
-📌 사전 분석 정보
-===============================
-{json.dumps(pre_analysis, ensure_ascii=False, indent=2)}
-
 ===============================
 📌 출력 JSON 스키마
 ===============================
-{json.dumps(schema_description, ensure_ascii=False, indent=2)}
+{json.dumps(schema, ensure_ascii=False, indent=2)}
 
 ===============================
 🔥 출력 방식
 ===============================
 - JSON만 출력
 - 앞뒤로 어떠한 문자도 출력하지 마십시오
+"""
+
+
+_CONTRACT_HEADER = {flag: _contract_header(flag) for flag in (True, False)}
+
+_CLAUSE_HEADER = f"""
+당신은 한국·영문 계약서를 분석하는 시니어 변호사입니다.
+아래 계약 조항 하나를 분석해 스키마를 **완전히 채운 JSON 객체 하나**를 생성해야 합니다.
+
+{RISK_LEVEL_RULE}
 
+===============================
+🚫 절대 금지 규칙
+===============================
+1) "" (빈 문자열) 금지
+2) [] (빈 배열) 금지
+3) JSON 외 텍스트 금지
+4) Markdown 코드블록 금지
+5) 필드 누락 금지
+
+===============================
+📌 출력 JSON 스키마
+===============================
+{json.dumps(CLAUSE_SCHEMA, ensure_ascii=False, indent=2)}
+"""
+
+# 언어별 규칙 블록
+_LANG_BLOCK = {
+    lang: f"""
+===============================
+📌 언어 규칙
+===============================
+{instruction}
+
+{value_rule}
 """
+    for lang, (instruction, value_rule) in LANG_RULES.items()
+}
+
+
+def _lang_block(output_language: str) -> str:
+    return _LANG_BLOCK.get(output_language, _LANG_BLOCK["ko"])
+
+
+_PRE_ANALYSIS_HEADER = """
+===============================
+📌 사전 분석 정보
+===============================
+"""
+
+_CLAUSE_INFO_HEADER = """
+===============================
+📌 조항 정보
+===============================
+"""
+
+
+def _dumps_payload(payload: dict) -> str:
+    """요청마다 달라지는 JSON 은 orjson 으로 직렬화 (json.dumps(indent=2, sort_keys=True) 와 같은 출력)"""
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode("utf-8")
+
+
+def build_contract_analysis_prompt(
+    original_text: str,
+    nlp_info: NLPInfo,
+    term_definitions: Dict[str, TermDefinition],
+    output_language: str = "ko",
+    include_clauses: bool = True,
+) -> str:
+    """
+    계약서 분석 LLM 프롬프트 생성기
+    include_clauses=False 면 clauses 는 조항별 프롬프트로 따로 분석하므로 스키마에서 뺀다.
+    """
+
+    # -----------------------------------------
+    # 조항/용어 사전 분석 정보
+    # -----------------------------------------
+    # 조항 원문 합계가 PROMPT_INPUT_TOKEN_BUDGET 을 넘으면 뒤쪽 조항은 생략
+    budget = settings.PROMPT_INPUT_TOKEN_BUDGET
+    clauses_payload = []
+    for c in nlp_info.clauses[:10]:
+        raw_text = truncate_to_tokens(c.raw_text, CLAUSE_TOKEN_BUDGET)
+        budget -= estimate_tokens(raw_text)
+        if budget < 0:
+            break
+        clauses_payload.append(
+            {
+                "clause_id": c.clause_id,
+                "title": c.title,
+                "raw_text": raw_text,
+            }
+        )
+
+    # 용어는 dict 순서가 아닌 용어명 순으로 고정 (같은 입력 → 같은 바이트열)
+    terms_payload = [
+        {
+            "term": t.term,
+            "korean": t.korean,
+            "english": t.english,
+            "source": t.source,
+        }
+        for _, t in islice(sorted(term_definitions.items()), 30)
+    ]
+
+    pre_analysis = {
+        "language": nlp_info.language,
+        "domain_tags_hint": nlp_info.domain_tags,
+        "parties_hint": nlp_info.parties,
+        "clauses": clauses_payload,
+        "terms": terms_payload,
+    }
+
+    # 문서마다 달라지는 부분은 사전 분석 JSON 뿐
+    return (
+        _CONTRACT_HEADER[include_clauses]
+        + _lang_block(output_language)
+        + _PRE_ANALYSIS_HEADER
+        + _dumps_payload(pre_analysis)
+        + "\n"
+    )
+
+
+def build_clause_analysis_prompt(
+    clause: Clause,
+    nlp_info: NLPInfo,
+    output_language: str = "ko",
+) -> str:
+    """
+    조항 1개 분석용 프롬프트 (조항별 동시 분석 모드)
+    문서 프롬프트와 마찬가지로 고정 영역을 앞에 둔다.
+    """
+    clause_info = {
+        "language": nlp_info.language,
+        "domain_tags_hint": nlp_info.domain_tags,
+        "parties_hint": nlp_info.parties,
+        "clause": {
+            "clause_id": clause.clause_id,
+            "title": clause.title,
+            "raw_text": truncate_to_tokens(clause.raw_text, SPLIT_CLAUSE_TOKEN_BUDGET),
+        },
+    }
 
-    return prompt
+    return (
+        _CLAUSE_HEADER
+        + _lang_block(output_language)
+        + _CLAUSE_INFO_HEADER
+        + _dumps_payload(clause_info)
+        + "\n"
+    )
@@ -0,0 +1,163 @@
+# backend/app/services/semantic_cache.py
+"""
+의미 기반(임베딩 유사도) 계약서 분석 캐시
+
+- 정확히 같은 텍스트는 llm_cache(해시 키)가 처리하고,
+  여기서는 OCR 잡음/공백 차이 정도만 있는 "거의 같은" 계약서를 잡는다.
+- 벡터는 llm_cache.db 의 semantic_cache 테이블에 저장하고,
+  네임스페이스(출력 언어 + 프롬프트 버전 + 모델)별 정규화 행렬을 메모리에 올려 내적(=코사인)으로 검색.
+- 분석 결과 자체는 따로 저장하지 않고 llm_cache 의 정확 일치 키를 가리킨다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import google.generativeai as genai
+import numpy as np
+
+from app.core.logger import logger
+
+
+EMBED_MODEL = "models/text-embedding-004"
+EMBED_MAX_CHARS = 2000     # 앞부분만 임베딩 (당사자/목적/주요 조항이 대부분 여기 있음)
+
+
+class SemanticCache:
+    def __init__(self, path: str, threshold: float, max_entries: int = 5000):
+        self._path = path
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._local = threading.local()
+
+        # namespace -> (정규화 벡터 행렬, cache_key 목록)
+        self._index: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        self._lock = threading.Lock()
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache ("
+            " namespace TEXT NOT NULL,"
+            " cache_key TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " PRIMARY KEY (namespace, cache_key))"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # ----------------------------------------------------------
+    # 임베딩
+    # ----------------------------------------------------------
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            result = await genai.embed_content_async(
+                model=EMBED_MODEL,
+                content=text[:EMBED_MAX_CHARS],
+                task_type="semantic_similarity",
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 임베딩 실패 → 의미 캐시 건너뜀: {e}")
+            return None
+
+        vec = np.asarray(result["embedding"], dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else None
+
+    # ----------------------------------------------------------
+    # 인덱스 (스레드에서 실행)
+    # ----------------------------------------------------------
+    def _load(self, namespace: str) -> Tuple[np.ndarray, List[str]]:
+        with self._lock:
+            cached = self._index.get(namespace)
+            if cached is not None:
+                return cached
+
+            rows = self._conn().execute(
+                "SELECT cache_key, vector FROM semantic_cache"
+                " WHERE namespace = ? ORDER BY rowid DESC LIMIT ?",
+                (namespace, self._max_entries),
+            ).fetchall()
+
+            keys = [k for k, _ in rows]
+            if rows:
+                matrix = np.vstack([np.frombuffer(v, dtype=np.float32) for _, v in rows])
+            else:
+                matrix = np.empty((0, 0), dtype=np.float32)
+
+            self._index[namespace] = (matrix, keys)
+            return matrix, keys
+
+    def _search(self, namespace: str, vec: np.ndarray) -> Optional[str]:
+        matrix, keys = self._load(namespace)
+        if not keys or matrix.shape[1] != vec.shape[0]:
+            return None
+
+        scores = matrix @ vec
+        best = int(scores.argmax())
+        return keys[best] if scores[best] >= self._threshold else None
+
+    def _add(self, namespace: str, cache_key: str, vec: np.ndarray) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO semantic_cache (namespace, cache_key, vector) VALUES (?, ?, ?)",
+            (namespace, cache_key, vec.tobytes()),
+        )
+        conn.commit()
+
+        matrix, keys = self._load(namespace)
+        with self._lock:
+            if cache_key in keys:
+                return
+            # 최신 항목을 앞에 두고 max_entries 를 넘으면 오래된 것부터 버림
+            if keys:
+                matrix = np.vstack([vec, matrix])[: self._max_entries]
+            else:
+                matrix = vec.reshape(1, -1)
+            keys = [cache_key] + keys[: self._max_entries - 1]
+            self._index[namespace] = (matrix, keys)
+
+    def _remove(self, namespace: str, cache_key: str) -> None:
+        conn = self._conn()
+        conn.execute(
+            "DELETE FROM semantic_cache WHERE namespace = ? AND cache_key = ?",
+            (namespace, cache_key),
+        )
+        conn.commit()
+
+        with self._lock:
+            cached = self._index.get(namespace)
+            if cached is None or cache_key not in cached[1]:
+                return
+            matrix, keys = cached
+            i = keys.index(cache_key)
+            self._index[namespace] = (np.delete(matrix, i, axis=0), keys[:i] + keys[i + 1:])
+
+    # ----------------------------------------------------------
+    # 공개 API
+    # ----------------------------------------------------------
+    async def get(self, text: str, namespace: str) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        유사한 기존 계약서의 llm_cache 키를 찾는다.
+        임베딩 벡터도 함께 돌려줘서, miss 후 put() 할 때 다시 임베딩하지 않도록 한다.
+        """
+        vec = await self._embed(text)
+        if vec is None:
+            return None, None
+        return await asyncio.to_thread(self._search, namespace, vec), vec
+
+    async def put(self, namespace: str, cache_key: str, vec: np.ndarray) -> None:
+        await asyncio.to_thread(self._add, namespace, cache_key, vec)
+
+    async def remove(self, namespace: str, cache_key: str) -> None:
+        """가리키던 llm_cache 항목이 만료된 벡터 제거 (죽은 벡터가 max_entries 를 차지하지 않도록)"""
+        await asyncio.to_thread(self._remove, namespace, cache_key)
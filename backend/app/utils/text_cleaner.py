@@ -1,12 +1,17 @@
 # backend/app/utils/text_cleaner.py
 
 import re
+import unicodedata
+
+_WHITESPACE = re.compile(r"\s+")
+_INLINE_SPACES = re.compile(r"[ \t]+")
+_EXTRA_NEWLINES = re.compile(r"\n{3,}")
 
 
 def normalize_whitespace(text: str) -> str:
     text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _INLINE_SPACES.sub(" ", text)
+    text = _EXTRA_NEWLINES.sub("\n\n", text)
     return text.strip()
 
 
@@ -17,3 +22,8 @@ def strip_surrounding_quotes(text: str) -> str:
     ):
         return text[1:-1].strip()
     return text
+
+
+def normalize_for_hash(text: str) -> str:
+    """캐시 키용 정규화: NFKC(전각/반각 통일) + 모든 공백을 한 칸으로"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
@@ -0,0 +1,37 @@
+# backend/app/utils/token_budget.py
+"""
+프롬프트 토큰 수 근사 (네트워크 호출 없이)
+
+- 영문/숫자/기호(ASCII): 약 4글자당 1토큰
+- 한글/한자 등 비 ASCII: 글자당 약 1토큰
+정확한 값은 Gemini count_tokens 로만 알 수 있지만(요청마다 왕복 발생),
+프롬프트 입력 예산을 맞추는 용도로는 이 근사치로 충분하다.
+"""
+
+ASCII_TOKEN_COST = 0.25
+NON_ASCII_TOKEN_COST = 1.0
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_count = len(text) - non_ascii
+    return int(non_ascii * NON_ASCII_TOKEN_COST + ascii_count * ASCII_TOKEN_COST + 0.999)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """앞에서부터 max_tokens(근사치)까지만 남긴다. 예산 안에 들면 원문 그대로 반환."""
+    if not text:
+        return text
+
+    # 글자당 최대 비용이 1토큰이므로 max_tokens 글자 이하면 자를 필요 없음
+    if len(text) <= max_tokens:
+        return text
+
+    used = 0.0
+    for i, ch in enumerate(text):
+        used += NON_ASCII_TOKEN_COST if ord(ch) > 127 else ASCII_TOKEN_COST
+        if used > max_tokens:
+            return text[:i]
+    return text
@@ -0,0 +1,33 @@
+# backend/tests/test_llm_fallback_cache.py
+"""Gemini 서킷 브레이커가 열렸을 때의 fallback 결과는 어떤 캐시에도 남지 않아야 한다."""
+
+import asyncio
+
+from app.core.resilience import CircuitOpenError
+from app.nlp.extractor import NLPInfo
+from app.services import llm
+
+
+def test_breaker_open_fallback_is_not_cached(monkeypatch):
+    llm_calls = []
+    persisted = []
+
+    async def _breaker_open(prompt: str) -> str:
+        llm_calls.append(prompt)
+        raise CircuitOpenError("Gemini 서킷 브레이커 열림")
+
+    monkeypatch.setattr(llm, "_run_contract_prompt", _breaker_open)
+    monkeypatch.setattr(llm.llm_cache, "get", lambda key: None)
+    monkeypatch.setattr(llm.llm_cache, "set", lambda key, value, ttl=None: persisted.append(key))
+
+    text = "제1조 (목적) 브레이커 fallback 캐시 테스트용 계약서"
+    nlp_info = NLPInfo()
+
+    first = asyncio.run(llm.analyze_contract(text, nlp_info, {}))
+    second = asyncio.run(llm.analyze_contract(text, nlp_info, {}))
+
+    assert first.document_id == "fallback"
+    assert second.document_id == "fallback"
+    # 두 번째 호출도 메모리 캐시가 아닌 LLM 경로까지 내려가야 함
+    assert len(llm_calls) == 2
+    assert persisted == []
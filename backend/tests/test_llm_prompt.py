@@ -0,0 +1,45 @@
+# backend/tests/test_llm_prompt.py
+"""계약서 프롬프트의 고정 프리픽스가 문서와 무관하게 바이트 단위로 같아야 한다 (Gemini 프리픽스 캐시)."""
+
+import hashlib
+
+from app.models.legal import TermDefinition
+from app.nlp.extractor import build_nlp_info
+from app.services.llm_prompt import (
+    _CONTRACT_HEADER,
+    _PRE_ANALYSIS_HEADER,
+    _lang_block,
+    build_contract_analysis_prompt,
+)
+
+
+CONTRACT_A = "제1조 (목적) 본 계약은 임대인과 임차인 간의 임대차에 관한 사항을 정한다.\n제2조 (보증금) 보증금은 1천만원으로 한다."
+CONTRACT_B = "제1조 (근로계약) 사용자는 근로자를 채용한다.\n제5조 (해지) 근로자는 30일 전에 통보하여 계약을 해지할 수 있다."
+
+
+def _terms(*names: str) -> dict:
+    return {n: TermDefinition(term=n, korean=f"{n} 정의") for n in names}
+
+
+def _prompt(text: str, terms: dict, language: str = "ko") -> str:
+    return build_contract_analysis_prompt(text, build_nlp_info(text), terms, language)
+
+
+def test_prefix_is_identical_across_contracts():
+    a = _prompt(CONTRACT_A, _terms("보증금", "임대차"))
+    b = _prompt(CONTRACT_B, _terms("해지", "근로자", "사용자"))
+
+    static = _CONTRACT_HEADER[True] + _lang_block("ko") + _PRE_ANALYSIS_HEADER
+    assert a.startswith(static)
+    assert b.startswith(static)
+    assert a != b
+
+    n = len(static)
+    assert hashlib.sha256(a[:n].encode("utf-8")).digest() == hashlib.sha256(b[:n].encode("utf-8")).digest()
+
+
+def test_same_input_gives_same_bytes_regardless_of_term_order():
+    forward = _terms("보증금", "임대차", "해지")
+    backward = dict(reversed(list(forward.items())))
+
+    assert _prompt(CONTRACT_A, forward) == _prompt(CONTRACT_A, backward)
@@ -0,0 +1,74 @@
+# backend/tests/test_migrations.py
+"""기존(컬럼 추가 전) DB 에 ensure_added_columns 를 돌리면 새 컬럼/인덱스가 생겨야 한다."""
+
+from sqlalchemy import create_engine, text
+
+from app.db.migrations import ensure_added_columns, ensure_added_indexes, ensure_unique_share_links
+
+
+def test_adds_batch_job_to_pre_change_document_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE document ("
+            " id INTEGER PRIMARY KEY,"
+            " user_id INTEGER NOT NULL,"
+            " summary TEXT)"
+        ))
+
+    ensure_added_columns(engine)
+    ensure_added_columns(engine)   # 두 번째 실행은 아무것도 하지 않아야 함
+
+    with engine.connect() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(document)"))}
+        indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(document)"))}
+
+    assert "batch_job" in columns
+    assert "ix_document_batch_job" in indexes
+
+
+def test_creates_listing_indexes_on_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE document (id INTEGER PRIMARY KEY, user_id INTEGER, created_at DATETIME)"
+        ))
+
+    ensure_added_indexes(engine)   # clauses/terms 테이블이 없어도 실패하지 않아야 함
+
+    with engine.connect() as conn:
+        indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(document)"))}
+
+    assert "ix_docs_user_created" in indexes
+
+
+def test_share_links_dedup_and_unique_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE share_links ("
+            " id INTEGER PRIMARY KEY,"
+            " conversation_id INTEGER NOT NULL,"
+            " token VARCHAR(64) NOT NULL UNIQUE)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX ix_share_links_conversation_id ON share_links (conversation_id)"
+        ))
+        conn.execute(text(
+            "INSERT INTO share_links (id, conversation_id, token)"
+            " VALUES (1, 7, 'a'), (2, 7, 'b'), (3, 8, 'c')"
+        ))
+
+    ensure_unique_share_links(engine)
+    ensure_unique_share_links(engine)
+
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT id FROM share_links ORDER BY id")).all()
+        # UNIQUE 가 있어야 ON CONFLICT(conversation_id) 가 동작
+        token = conn.execute(text(
+            "INSERT INTO share_links (conversation_id, token) VALUES (7, 'z')"
+            " ON CONFLICT(conversation_id) DO UPDATE SET token = token RETURNING token"
+        )).scalar_one()
+
+    assert [r[0] for r in rows] == [1, 3]
+    assert token == "a"
@@ -0,0 +1,60 @@
+# backend/tests/test_resilience.py
+"""CircuitBreaker half-open: reset_timeout 이 지나도 시험 호출은 하나만 통과해야 한다."""
+
+import asyncio
+
+import pytest
+
+from app.core.resilience import CircuitBreaker, CircuitOpenError, retry_async
+
+
+def _open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("test", fail_max=1, reset_timeout=0.01)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.is_open
+    return breaker
+
+
+def test_half_open_admits_single_probe():
+    breaker = _open_breaker()
+
+    async def _run():
+        await asyncio.sleep(0.02)
+        gate = asyncio.Event()
+        calls = []
+
+        async def _probe():
+            calls.append(1)
+            await gate.wait()
+            return "ok"
+
+        probe = asyncio.create_task(retry_async(_probe, retry_on=(TimeoutError,), breaker=breaker))
+        await asyncio.sleep(0)
+
+        # 시험 호출이 끝나기 전의 다른 호출은 모두 차단
+        for _ in range(5):
+            with pytest.raises(CircuitOpenError):
+                await retry_async(_probe, retry_on=(TimeoutError,), breaker=breaker)
+
+        gate.set()
+        assert await probe == "ok"
+        return calls
+
+    assert len(asyncio.run(_run())) == 1
+    assert not breaker.is_open
+
+
+def test_failed_probe_reopens():
+    breaker = _open_breaker()
+
+    async def _fail():
+        raise TimeoutError()
+
+    async def _run():
+        await asyncio.sleep(0.02)
+        with pytest.raises(CircuitOpenError):
+            await retry_async(_fail, retry_on=(TimeoutError,), breaker=breaker, initial_wait=0)
+
+    asyncio.run(_run())
+    assert breaker.is_open
@@ -1,8 +1,8 @@
-import os
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
+from shared_clients import get_gemini_client
+
 # 우리가 만든 모듈들
 from legal_search import search_law_articles_semantically
 from precedent_rag import search_precedents
@@ -14,11 +14,10 @@ from deepeval.metrics import FaithfulnessMetric, AnswerRelevancyMetric
 from deepeval.test_case import LLMTestCase
 
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 def get_genai_client():
-    if not GEMINI_API_KEY: return None
-    return genai.Client(api_key=GEMINI_API_KEY)
+    # 매 호출마다 새로 만들지 않고 공유 클라이언트를 재사용
+    return get_gemini_client()
 
 # --- 1. 통합 검색 및 답변 생성 ---
 def generate_integrated_answer(user_question):
@@ -1,13 +1,25 @@
-import streamlit as st
 import aiohttp
 import asyncio
 import re
 import os
 import json
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
 from konlpy.tag import Okt
 from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor # ⭐️ 스레드 실행을 위해 추가
-print("DEBUG: legal_dict.py 모듈 로딩 시작...") # ⭐️ 모듈 로드 확인용 로그
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:   # orjson 이 없으면 표준 json 사용
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
 load_dotenv()
 # --- 1. 전역 변수 설정 ---
 # ⭐️ .env 파일을 사용하지 않는 대신, Streamlit의 secrets.toml이나
@@ -15,6 +27,101 @@ load_dotenv()
 #    st.secrets["MOLEG_API_KEY"] 또는 os.environ.get("MOLEG_API_KEY")
 #    여기서는 하드코딩된 예시를 사용합니다. (보안상 좋지 않음)
 API_KEY = os.getenv("MOLEG_API_KEY") # 👈 본인의 API 키로 변경 (또는 st.secrets["MOLEG_API_KEY"] 사용)
+
+# 정의문 정제용 정규식 (HTML 태그/엔티티, 영문, 한자 괄호) - 용어마다 호출되므로 미리 컴파일
+_DEF_NOISE = re.compile(r'<[^>]+>|&[a-zA-Z0-9#]+;|[a-zA-Z]|\([一-龥\s]+\)')
+# --- 1-1. 용어 정의 캐시 (메모리 LRU + SQLite 디스크) ---
+TERM_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "legal_terms_cache.db")
+TERM_CACHE_TTL = 60 * 60 * 24 * 30   # 30일 (법령 용어 정의는 거의 바뀌지 않음)
+TERM_QUERY_CHUNK = 900               # IN (...) 바인딩 변수 수 (SQLite 기본 한도 999 미만)
+
+
+class TermCache:
+    """
+    용어 → {"korean_original", "english"} 캐시.
+    메모리(LRU)에서 먼저 찾고, 없으면 SQLite 에서 한 번에 조회한다.
+    정의를 찾은 용어만 저장 (조회 실패는 다음 요청에서 다시 시도).
+    """
+
+    def __init__(self, path, ttl=TERM_CACHE_TTL, maxsize=10000):
+        self._path = path
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS terms ("
+                " term TEXT PRIMARY KEY,"
+                " korean TEXT NOT NULL,"
+                " english TEXT,"
+                " fetched_at INTEGER NOT NULL)"
+            )
+
+    def _connect(self):
+        # Streamlit 은 세션마다 다른 스레드에서 실행 → 호출마다 커넥션을 연다
+        return sqlite3.connect(self._path, timeout=5)
+
+    def _remember(self, term, data):
+        with self._lock:
+            self._memory[term] = data
+            self._memory.move_to_end(term)
+            if len(self._memory) > self._maxsize:
+                self._memory.popitem(last=False)
+
+    def get_many(self, terms):
+        found = {}
+        missing = []
+        with self._lock:
+            for term in terms:
+                data = self._memory.get(term)
+                if data is None:
+                    missing.append(term)
+                else:
+                    self._memory.move_to_end(term)
+                    found[term] = data
+
+        if not missing:
+            return found
+
+        min_fetched_at = int(time.time()) - self._ttl
+        rows = []
+        with closing(self._connect()) as conn:
+            # 용어가 많은 문서도 바인딩 변수 한도를 넘지 않도록 나눠서 조회
+            for i in range(0, len(missing), TERM_QUERY_CHUNK):
+                chunk = missing[i:i + TERM_QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows += conn.execute(
+                    f"SELECT term, korean, english FROM terms"
+                    f" WHERE fetched_at >= ? AND term IN ({placeholders})",
+                    (min_fetched_at, *chunk),
+                ).fetchall()
+
+        for term, korean, english in rows:
+            data = {"korean_original": korean, "english": english or "N/A"}
+            self._remember(term, data)
+            found[term] = data
+
+        return found
+
+    def set_many(self, definitions):
+        if not definitions:
+            return
+
+        now = int(time.time())
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO terms (term, korean, english, fetched_at) VALUES (?, ?, ?, ?)",
+                [(t, d["korean_original"], d["english"], now) for t, d in definitions.items()],
+            )
+
+        for term, data in definitions.items():
+            self._remember(term, data)
+
+
+term_cache = TermCache(TERM_CACHE_PATH)
+
 # --- 2. Okt 캐싱 (Streamlit 무관하게 동작하도록 수정) ---
 _okt_instance = None
 
@@ -24,37 +131,79 @@ def get_okt_tagger():
         try:
             _okt_instance = Okt()
         except Exception as e:
-            print(f"❌ Okt 로딩 실패: {e}")
+            logger.error("❌ Okt 로딩 실패: %s", e)
             return None
     return _okt_instance
 
-# Streamlit 캐싱 래퍼 (앱 실행 시 사용)
-if hasattr(st, "cache_resource"):
-    get_okt_tagger_cached = st.cache_resource(get_okt_tagger)
-else:
-    get_okt_tagger_cached = get_okt_tagger
+
+# --- 3-0. 법제처 API 전용 이벤트 루프 / 공용 세션 ---
+# aiohttp 세션은 만든 이벤트 루프에 묶이므로, 백그라운드 스레드에서 루프 하나를 계속 돌리고
+# 모든 조회를 그 루프에 제출한다 → 세션(keep-alive 커넥션)을 요청 간에 재사용
+MAX_CONCURRENT_REQUESTS = 15
+_SEM = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)   # 첫 사용 시 전용 루프에 묶임
+
+_loop = None
+_loop_lock = threading.Lock()
+_session = None
+
+
+def _get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="legal-dict-loop", daemon=True).start()
+    return _loop
+
+
+def _get_session():
+    """전용 루프 안에서만 호출"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, limit_per_host=10, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return _session
+
+
+def run_on_term_loop(coro):
+    """동기 코드에서 코루틴을 전용 루프에 제출하고 결과를 기다린다."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+@atexit.register
+def _close_session():
+    if _loop is not None and _session is not None and not _session.closed:
+        asyncio.run_coroutine_threadsafe(_session.close(), _loop).result(timeout=5)
 
 
 # --- 3. 비동기 API 호출 함수 (핵심 로직) ---
 async def fetch_term_definition(session, term):
+    """동시 요청 수를 제한하며 단일 용어를 조회합니다 (법제처 쓰로틀링/타임아웃 연쇄 방지)."""
+    async with _SEM:
+        return await _request_term_definition(session, term)
+
+
+async def _request_term_definition(session, term):
     """단일 용어에 대해 API를 비동기로 호출하고 파싱합니다."""
     API_URL = f"http://www.law.go.kr/DRF/lawService.do?OC={API_KEY}&target=lstrm&query={term}&type=JSON"
 
     
     try:
-        async with session.get(API_URL, timeout=5) as response:
+        async with session.get(API_URL) as response:
             if response.status != 200:
-                print(f"⚠️ [{term}] API 상태 코드 오류: {response.status}")
+                logger.warning("⚠️ [%s] API 상태 코드 오류: %s", term, response.status)
                 return term, None
 
             try:
                 # content_type=None 허용 (API가 text/html로 줄 때가 있음)
-                data = await response.json(content_type=None)
+                data = _json_loads(await response.read())
             except Exception as e:
-                print(f"⚠️ [{term}] JSON 변환 실패: {e}")
+                logger.warning("⚠️ [%s] JSON 변환 실패: %s", term, e)
                 # 텍스트로 뭐가 왔는지 확인
                 text_response = await response.text()
-                print(f"   응답 내용(일부): {text_response[:100]}")
+                logger.warning("   응답 내용(일부): %s", text_response[:100])
                 return term, None
             
             # --- 데이터 파싱 로직 ---
@@ -102,32 +251,39 @@ async def fetch_term_definition(session, term):
 
             if korean_def:
                 # 전처리 (HTML, 영어 등 제거)
-                korean_def = re.sub(r'<[^>]+>|&[a-zA-Z0-9#]+;|[a-zA-Z]|\([一-龥\s]+\)', '', korean_def)
+                korean_def = _DEF_NOISE.sub('', korean_def)
                 korean_def = ' '.join(korean_def.split())
                 
                 return term, {"korean_original": korean_def, "english": english_def or "N/A"}
 
     except Exception as e:
-        print(f"❌ [{term}] 처리 중 예기치 못한 오류: {e}")
+        logger.error("❌ [%s] 처리 중 예기치 못한 오류: %s", term, e)
 
     return term, None
 
 # --- 4. 비동기 배치 처리기 ---
 async def fetch_all_terms(terms):
-    async with aiohttp.ClientSession() as session:
-        tasks = [fetch_term_definition(session, term) for term in terms]
-        return await asyncio.gather(*tasks)
-# ⭐️ 헬퍼 함수: 비동기 함수를 별도 스레드에서 안전하게 실행
-def run_async_in_thread(coro):
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(asyncio.run, coro)
-        return future.result()
-# --- 5. 메인 함수 (동기 래퍼) ---
-def extract_and_define_terms(text):
-    okt = get_okt_tagger_cached()
+    # 캐시에 있는 용어는 API 를 부르지 않음
+    cached = term_cache.get_many(terms)
+    to_fetch = [t for t in terms if t not in cached]
+
+    fetched = []
+    if to_fetch:
+        session = _get_session()
+        tasks = [fetch_term_definition(session, term) for term in to_fetch]
+        fetched = await asyncio.gather(*tasks)
+
+        term_cache.set_many({term: data for term, data in fetched if data})
+
+    return list(cached.items()) + list(fetched)
+# --- 5. 메인 함수 ---
+# 동기 코드(Streamlit)에서는 run_on_term_loop(extract_and_define_terms(text)) 로 호출
+async def extract_and_define_terms(text):
+    okt = get_okt_tagger()
     if not okt: return {}
 
-    nouns = okt.nouns(text)
+    # 형태소 분석(JVM 호출)은 이벤트 루프 밖에서 실행
+    nouns = await asyncio.to_thread(okt.nouns, text)
     
     stopwords = {
         "제", "조", "항", "호", "것", "수", "때", "년", "월", "일", "시", "분", "초", "개", "원", "명",
@@ -141,27 +297,7 @@ def extract_and_define_terms(text):
     if not target_terms:
         return {}
 
-    # Streamlit 환경 체크 (이벤트 루프 충돌 방지)
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-    # 이미 실행 중인 루프가 있다면 그 안에서 실행, 아니면 run_until_complete
-    if loop.is_running():
-        # Streamlit 등 이미 루프가 도는 환경
-        future = asyncio.ensure_future(fetch_all_terms(target_terms))
-        # 동기 함수에서 비동기 결과를 기다리는 것은 복잡하므로,
-        # 여기서는 간단히 새 루프를 만드는 방식 대신 기존 루프 활용 시도
-        # (Streamlit은 보통 별도 스레드라 run_until_complete가 안전)
-        pass 
-    
-    # 안전한 새 루프 생성 및 실행
-    new_loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(new_loop)
-    results = new_loop.run_until_complete(fetch_all_terms(target_terms))
-    new_loop.close()
+    results = await fetch_all_terms(target_terms)
 
     return {term: data for term, data in results if data}
 
@@ -180,7 +316,7 @@ if __name__ == "__main__":
     
     # 3. 실행
     print("3. 함수 실행 중...")
-    result = extract_and_define_terms(test_text)
+    result = run_on_term_loop(extract_and_define_terms(test_text))
     
     print("\n4. 결과 확인:")
     print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -1,10 +1,11 @@
-import requests
 import os
 import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
 from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_core.documents import Document
+
+from shared_clients import get_http_session
 # --- 설정 ---
 load_dotenv()
 MOLEG_API_KEY = os.getenv("MOLEG_API_KEY")
@@ -17,7 +18,7 @@ def search_law_id(law_name):
     SEARCH_URL = f"http://www.law.go.kr/DRF/lawSearch.do?OC={MOLEG_API_KEY}&target=eflaw&query={law_name}&type=xml"
     print(SEARCH_URL)
     try:
-        response = requests.get(SEARCH_URL, timeout=5)
+        response = get_http_session().get(SEARCH_URL, timeout=5)
         if response.status_code == 200:
             try:
                 root = ET.fromstring(response.content)
@@ -76,7 +77,7 @@ def get_law_content_xml(law_id):
     print(DETAIL_URL)
 
     try:
-        response = requests.get(DETAIL_URL, timeout=10)
+        response = get_http_session().get(DETAIL_URL, timeout=10)
         if response.status_code == 200:
             return response.content
     except Exception as e:
@@ -1,15 +1,18 @@
-import os
 import json
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
+from shared_clients import get_gemini_client
+
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+class InterpretationError(Exception):
+    """본문 해석 스트리밍 실패 (메시지는 화면에 그대로 보여줄 문구)"""
+
 
 def get_genai_client():
-    if not GEMINI_API_KEY: return None
-    return genai.Client(api_key=GEMINI_API_KEY)
+    # 매 호출마다 새로 만들지 않고 공유 클라이언트를 재사용
+    return get_gemini_client()
 
 def call_gemini_api(prompt, temperature=0.3):
     # (기존 코드 동일)
@@ -96,92 +99,107 @@ def generate_legal_answer(user_question, law_name, articles):
 #  기능 B: 쉬운 법률 해석 (계약서/판례 풀이)
 # ============================================================
 
-def create_easy_legal_interpretation(original_text: str, term_definitions: dict) -> dict:
+# 고정 지시문은 system_instruction 으로 분리해 컨텍스트 캐시로 재사용합니다.
+# 본문 해석은 용어 정의 없이도 만들 수 있으므로, 법제처 조회와 동시에 실행할 수 있도록
+# '본문 해석'과 '쉬운 용어 사전' 두 호출로 나눕니다.
+EASY_INTERPRETATION_MODEL = "gemini-2.5-flash"
+
+EASY_MAIN_SYSTEM_PROMPT = """
+당신은 법률 문서를 초등학생도 이해할 수 있게 설명해주는 친절한 변호사입니다.
+사용자가 제공하는 [원본 텍스트]의 내용을 문단별로 나누어, 아주 쉽고 명확하게 풀어서 설명해주세요.
+어려운 법률 용어가 나오면 그 자리에서 쉬운 말로 함께 풀어주세요.
+
+🚨 [중요 제약 사항] 🚨
+- **(굵게), ##(제목) 등의 마크다운 문법을 절대 사용하지 마세요.**
+- 오직 순수한 텍스트(Plain Text)로만 작성하세요.
+- 문단 사이에는 줄바꿈(\\n)만 사용하세요.
+- 친절하고 부드러운 말투(~해요, ~입니다)를 사용하세요.
+"""
+
+EASY_TERMS_SYSTEM_PROMPT = """
+당신은 법률 용어를 초등학생도 이해할 수 있게 설명해주는 친절한 변호사입니다.
+사용자가 제공하는 [법률 용어 목록]에 있는 각 용어의 뜻을 초등학생도 알 수 있게 '한 문장'으로 아주 쉽게 요약하세요.
+
+🚨 [중요 제약 사항] 🚨
+- 마크다운 문법을 사용하지 마세요.
+- 친절하고 부드러운 말투(~해요, ~입니다)를 사용하세요.
+
+[응답 형식 (JSON)]:
+{
+    "용어1": "쉬운 요약 1",
+    "용어2": "쉬운 요약 2"
+}
+"""
+
+# ============================================================
+#  Gemini 생성 설정 (고정 system_instruction)
+# ============================================================
+# 시스템 프롬프트가 명시적 컨텍스트 캐시의 최소 토큰 수보다 훨씬 짧아 caches.create 는 항상 거부됨
+# → 매번 같은 system_instruction 을 앞에 두고 Gemini 의 암묵적 프리픽스 캐시에 맡긴다
+def _build_generate_config(system_instruction, **kwargs):
+    return types.GenerateContentConfig(system_instruction=system_instruction, **kwargs)
+
+
+def stream_easy_legal_interpretation(original_text: str):
     """
-    복잡한 법률 텍스트와 용어 정의를 입력받아,
-    1. 용어 정의를 쉽게 요약하고
-    2. 본문을 쉽게 해석하여 JSON으로 반환합니다.
+    법률 텍스트 본문 해석을 Gemini 스트리밍으로 받아 조각(str) 단위로 yield 합니다.
+    st.write_stream 에 바로 넘겨 첫 토큰부터 화면에 표시할 수 있습니다.
+    실패하면 오류 문구를 yield 하지 않고 InterpretationError 를 던집니다 (호출부가 캐시하지 않도록).
     """
     client = get_genai_client()
     if not client:
-        return {
-            "main_interpretation": "API 키가 설정되지 않았습니다.",
-            "simplified_terms": {}
-        }
+        raise InterpretationError("API 키가 설정되지 않았습니다.")
 
-    print("Gemini API (Single Call) 서비스 호출 시작...")
-    
-    # 1. 프롬프트에 넣을 용어 정의 목록 생성
-    terms_context = ""
-    if term_definitions:
-        for term, data in term_definitions.items():
-            terms_context += f"- {term}: {data['korean_original']}\n"
-    else:
-        terms_context = "(참고할 용어 정의 없음)"
+    print("Gemini API (본문 해석, 스트리밍) 서비스 호출 시작...")
 
-    # 2. 통합 프롬프트 작성 (JSON 출력을 강제함)
-    prompt = f"""
-    당신은 법률 문서를 초등학생도 이해할 수 있게 설명해주는 친절한 변호사입니다.
-    아래 제공된 [원본 텍스트]와 [법률 용어 목록]을 바탕으로 다음 두 가지 작업을 수행해주세요.
+    try:
+        stream = client.models.generate_content_stream(
+            model=EASY_INTERPRETATION_MODEL,
+            contents=f"[원본 텍스트]:\n{original_text}",
+            config=_build_generate_config(
+                EASY_MAIN_SYSTEM_PROMPT,
+                temperature=0.3,
+            )
+        )
+        for chunk in stream:
+            if chunk.text:
+                yield chunk.text
 
-    [작업 1] '쉬운 용어 사전' 만들기:
-    제공된 [법률 용어 목록]에 있는 각 용어의 뜻을 초등학생도 알 수 있게 '한 문장'으로 아주 쉽게 요약하세요.
+    except Exception as e:
+        print(f"Gemini API 호출 오류: {e}")
+        raise InterpretationError(f"오류가 발생했습니다: {str(e)}") from e
 
-    [작업 2] '본문 해석' 하기:
-    [원본 텍스트]의 내용을 문단별로 나누어, 위에서 만든 쉬운 용어들을 활용해 아주 쉽고 명확하게 풀어서 설명해주세요.
 
-    🚨 [중요 제약 사항] 🚨
-    - **(굵게), ##(제목) 등의 마크다운 문법을 절대 사용하지 마세요.**
-    - 오직 순수한 텍스트(Plain Text)로만 작성하세요.
-    - 문단 사이에는 줄바꿈(\\n)만 사용하세요.
-    - 친절하고 부드러운 말투(~해요, ~입니다)를 사용하세요.
+def simplify_legal_terms(term_definitions: dict) -> dict:
+    """
+    법제처 용어 정의를 받아 용어별 '쉬운 한 문장 정의' 딕셔너리를 반환합니다.
+    """
+    if not term_definitions:
+        return {}
 
-    --------------------------------------------------------
-    [법률 용어 목록 (원본 정의)]:
-    {terms_context}
+    client = get_genai_client()
+    if not client:
+        return {}
 
-    [원본 텍스트]:
-    {original_text}
-    --------------------------------------------------------
+    print("Gemini API (쉬운 용어 사전) 서비스 호출 시작...")
 
-    [응답 형식 (JSON)]:
-    {{
-        "simplified_terms": {{
-            "용어1": "쉬운 요약 1",
-            "용어2": "쉬운 요약 2"
-        }},
-        "main_interpretation": "여기에 마크다운 없는 순수 텍스트로 해석을 적어주세요."
-    }}
-    """
+    terms_context = ""
+    for term, data in term_definitions.items():
+        terms_context += f"- {term}: {data['korean_original']}\n"
 
     try:
-        # 3. Gemini API 호출 (JSON 모드 사용)
         response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=types.GenerateContentConfig(
+            model=EASY_INTERPRETATION_MODEL,
+            contents=f"[법률 용어 목록 (원본 정의)]:\n{terms_context}",
+            config=_build_generate_config(
+                EASY_TERMS_SYSTEM_PROMPT,
                 temperature=0.3,
                 response_mime_type="application/json" # JSON 응답 강제
             )
         )
-        
-        if response.text:
-            result_data = json.loads(response.text)
-            print("Gemini 응답 및 파싱 완료.")
-            
-            return {
-                "main_interpretation": result_data.get("main_interpretation", "해석 생성 실패"),
-                "simplified_terms": result_data.get("simplified_terms", {})
-            }
-        else:
-            return {
-                "main_interpretation": "AI가 빈 응답을 반환했습니다.",
-                "simplified_terms": {}
-            }
-            
+        return json.loads(response.text) if response.text else {}
+
     except Exception as e:
         print(f"Gemini API 호출 오류: {e}")
-        return {
-            "main_interpretation": f"오류가 발생했습니다: {str(e)}",
-            "simplified_terms": {}
-        }
\ No newline at end of file
+        return {}
+
@@ -1,14 +1,13 @@
-import os
 import json
 from dotenv import load_dotenv
 from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import HuggingFaceEmbeddings
-from google import genai
 from google.genai import types
 
+from shared_clients import get_gemini_client
+
 # --- 설정 ---
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 DB_PATH = "precedent_faiss_db"
 EMBEDDING_MODEL = "jhgan/ko-sbert-nli"
 
@@ -38,8 +37,8 @@ def load_vector_db():
         return None
 
 def get_genai_client():
-    if not GEMINI_API_KEY: return None
-    return genai.Client(api_key=GEMINI_API_KEY)
+    # 매 호출마다 새로 만들지 않고 공유 클라이언트를 재사용
+    return get_gemini_client()
 
 def search_precedents(query, k=3):
     """질문과 관련된 판례 k개를 검색합니다."""
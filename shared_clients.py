@@ -0,0 +1,30 @@
+import os
+
+import requests
+import streamlit as st
+from dotenv import load_dotenv
+from google import genai
+from requests.adapters import HTTPAdapter
+
+load_dotenv()
+
+
+# --- Gemini 클라이언트 (Streamlit 재실행/사용자 간 공유) ---
+@st.cache_resource
+def get_gemini_client():
+    """프로세스 전체에서 하나만 만들어 재사용하는 Gemini 클라이언트 (키가 없으면 None)"""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return None
+    return genai.Client(api_key=api_key)
+
+
+# --- 법제처 API 등 외부 HTTP 호출용 세션 (keep-alive 커넥션 재사용) ---
+@st.cache_resource
+def get_http_session():
+    """커넥션 풀을 가진 requests.Session 을 하나만 만들어 재사용합니다."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
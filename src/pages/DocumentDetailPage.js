@@ -36,12 +36,10 @@ export default function DocumentDetailPage() {
         setLoading(true);
         setError(null);
 
-        const detailRes = await api.get(`/contracts/${id}`);
+        // 상세 + 조항 + 용어를 한 번에 조회
+        const detailRes = await api.get(`/contracts/${id}/full`);
         const meta = detailRes.data;
 
-        const clauseRes = await api.get(`/contracts/${id}/clauses`);
-        const termRes = await api.get(`/contracts/${id}/terms`);
-
         // ⭐ 수정된 pseudoDoc (백엔드 응답 구조 기반)
         const pseudoDoc = {
           document_id: String(meta.id),
@@ -77,7 +75,7 @@ export default function DocumentDetailPage() {
             comments: meta.risk_comments || "",
           },
 
-          clauses: (clauseRes.data || []).map((c) => ({
+          clauses: (meta.clauses || []).map((c) => ({
             clause_id: c.clause_id,
             title: c.title,
             raw_text: c.raw_text,
@@ -94,7 +92,7 @@ export default function DocumentDetailPage() {
 
           causal_graph: [],
 
-          terms: (termRes.data || []).map((t) => ({
+          terms: (meta.terms || []).map((t) => ({
             term: t.term,
             korean: t.korean,
             english: t.english,